@@ -0,0 +1,32 @@
+"""add_certificate_user_playlist_unique
+
+Revision ID: 2b9d5e4f6a10
+Revises: 7e1f3b8c2a94
+Create Date: 2026-10-15 15:42:08.318275
+
+"""
+from typing import Sequence, Union
+
+from alembic import op
+import sqlalchemy as sa
+
+
+# revision identifiers, used by Alembic.
+revision: str = '2b9d5e4f6a10'
+down_revision: Union[str, Sequence[str], None] = '7e1f3b8c2a94'
+branch_labels: Union[str, Sequence[str], None] = None
+depends_on: Union[str, Sequence[str], None] = None
+
+
+def upgrade() -> None:
+    """Upgrade schema."""
+    op.create_unique_constraint(
+        'uq_certificate_user_playlist',
+        'certificates',
+        ['user_id', 'playlist_id'],
+    )
+
+
+def downgrade() -> None:
+    """Downgrade schema."""
+    op.drop_constraint('uq_certificate_user_playlist', 'certificates', type_='unique')
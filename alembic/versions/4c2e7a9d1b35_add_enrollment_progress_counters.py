@@ -0,0 +1,52 @@
+"""add_enrollment_progress_counters
+
+Revision ID: 4c2e7a9d1b35
+Revises: 39919f75178e
+Create Date: 2026-10-15 10:12:41.208317
+
+"""
+from typing import Sequence, Union
+
+from alembic import op
+import sqlalchemy as sa
+
+
+# revision identifiers, used by Alembic.
+revision: str = '4c2e7a9d1b35'
+down_revision: Union[str, Sequence[str], None] = '39919f75178e'
+branch_labels: Union[str, Sequence[str], None] = None
+depends_on: Union[str, Sequence[str], None] = None
+
+
+def upgrade() -> None:
+    """Upgrade schema."""
+    op.add_column('enrollments', sa.Column('watched_count', sa.Integer(), server_default='0', nullable=False))
+    op.add_column('enrollments', sa.Column('quiz_score_sum', sa.Integer(), server_default='0', nullable=False))
+    op.add_column('enrollments', sa.Column('quiz_score_count', sa.Integer(), server_default='0', nullable=False))
+
+    # Backfill the counters from existing progress rows
+    op.execute(
+        """
+        UPDATE enrollments AS e
+        SET watched_count = agg.watched_count,
+            quiz_score_sum = agg.quiz_score_sum,
+            quiz_score_count = agg.quiz_score_count
+        FROM (
+            SELECT
+                enrollment_id,
+                COUNT(*) FILTER (WHERE watch_status = 'WATCHED') AS watched_count,
+                COALESCE(SUM(quiz_score), 0) AS quiz_score_sum,
+                COUNT(quiz_score) AS quiz_score_count
+            FROM video_progress
+            GROUP BY enrollment_id
+        ) AS agg
+        WHERE agg.enrollment_id = e.id
+        """
+    )
+
+
+def downgrade() -> None:
+    """Downgrade schema."""
+    op.drop_column('enrollments', 'quiz_score_count')
+    op.drop_column('enrollments', 'quiz_score_sum')
+    op.drop_column('enrollments', 'watched_count')
@@ -0,0 +1,38 @@
+"""add_video_progress_eligibility_index
+
+Revision ID: 5a8c1d3e9f27
+Revises: 2b9d5e4f6a10
+Create Date: 2026-10-15 16:20:51.904613
+
+"""
+from typing import Sequence, Union
+
+from alembic import op
+import sqlalchemy as sa
+
+
+# revision identifiers, used by Alembic.
+revision: str = '5a8c1d3e9f27'
+down_revision: Union[str, Sequence[str], None] = '2b9d5e4f6a10'
+branch_labels: Union[str, Sequence[str], None] = None
+depends_on: Union[str, Sequence[str], None] = None
+
+
+def upgrade() -> None:
+    """Upgrade schema."""
+    # CREATE INDEX CONCURRENTLY cannot run inside a transaction
+    with op.get_context().autocommit_block():
+        op.create_index(
+            'ix_vp_enroll_video',
+            'video_progress',
+            ['enrollment_id', 'video_id'],
+            unique=False,
+            postgresql_include=['watch_status', 'is_quiz_passed', 'id'],
+            postgresql_concurrently=True,
+        )
+
+
+def downgrade() -> None:
+    """Downgrade schema."""
+    with op.get_context().autocommit_block():
+        op.drop_index('ix_vp_enroll_video', table_name='video_progress', postgresql_concurrently=True)
@@ -0,0 +1,45 @@
+"""add_video_progress_aggregation_indexes
+
+Revision ID: 7e1f3b8c2a94
+Revises: 4c2e7a9d1b35
+Create Date: 2026-10-15 11:03:27.554190
+
+"""
+from typing import Sequence, Union
+
+from alembic import op
+import sqlalchemy as sa
+
+
+# revision identifiers, used by Alembic.
+revision: str = '7e1f3b8c2a94'
+down_revision: Union[str, Sequence[str], None] = '4c2e7a9d1b35'
+branch_labels: Union[str, Sequence[str], None] = None
+depends_on: Union[str, Sequence[str], None] = None
+
+
+def upgrade() -> None:
+    """Upgrade schema."""
+    # CREATE INDEX CONCURRENTLY cannot run inside a transaction
+    with op.get_context().autocommit_block():
+        op.create_index(
+            'ix_vp_enroll_status',
+            'video_progress',
+            ['enrollment_id', 'watch_status'],
+            unique=False,
+            postgresql_concurrently=True,
+        )
+        op.create_index(
+            'ix_vp_enroll_quizscore',
+            'video_progress',
+            ['enrollment_id', 'quiz_score'],
+            unique=False,
+            postgresql_concurrently=True,
+        )
+
+
+def downgrade() -> None:
+    """Downgrade schema."""
+    with op.get_context().autocommit_block():
+        op.drop_index('ix_vp_enroll_quizscore', table_name='video_progress', postgresql_concurrently=True)
+        op.drop_index('ix_vp_enroll_status', table_name='video_progress', postgresql_concurrently=True)
@@ -6,7 +6,8 @@ Endpoints for triggering content analysis on courses.
 
 from typing import Annotated
 
-from fastapi import APIRouter, Depends, HTTPException, status
+import orjson
+from fastapi import APIRouter, Depends, HTTPException, Response, status
 from sqlalchemy.ext.asyncio import AsyncSession
 
 from app.api.deps import get_current_active_user
@@ -51,7 +52,7 @@ async def analyze_course(
         Processing results with success/failure counts.
     """
     # Verify the course exists and user is the creator
-    course = await course_service.get_course_by_id(course_id, db)
+    course = await course_service.get_course_metadata_cached(course_id, db)
     
     if course.creator_id != current_user.id:
         raise HTTPException(
@@ -75,7 +76,7 @@ async def analyze_course(
 async def get_analysis_status(
     course_id: int,
     db: Annotated[AsyncSession, Depends(get_db)],
-) -> dict:
+) -> Response:
     """
     Get the analysis status summary for a course.
     
@@ -89,14 +90,14 @@ async def get_analysis_status(
         Status counts and summary.
     """
     # Verify course exists
-    await course_service.get_course_by_id(course_id, db)
+    await course_service.get_course_metadata_cached(course_id, db)
     
     status = await processing_service.get_analysis_status(
         playlist_id=course_id,
         db=db,
     )
     
-    return {
-        "course_id": course_id,
-        **status,
-    }
+    return Response(
+        content=orjson.dumps({"course_id": course_id, **status}),
+        media_type="application/json",
+    )
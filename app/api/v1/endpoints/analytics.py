@@ -6,7 +6,7 @@ Endpoints for creator analytics.
 
 from typing import Annotated, List
 
-from fastapi import APIRouter, Depends
+from fastapi import APIRouter, Depends, Response
 from sqlalchemy.ext.asyncio import AsyncSession
 
 from app.api.deps import get_current_active_user
@@ -28,7 +28,7 @@ async def get_course_analytics(
     course_id: int,
     current_user: Annotated[User, Depends(get_current_active_user)],
     db: Annotated[AsyncSession, Depends(get_db)],
-) -> CourseAnalyticsResponse:
+) -> Response:
     """
     Get detailed analytics for a course.
     
@@ -48,8 +48,14 @@ async def get_course_analytics(
     Returns:
         List of analytics rows.
     """
-    return await analytics_service.get_course_analytics(
+    analytics = await analytics_service.get_course_analytics(
         creator_id=current_user.id,
         playlist_id=course_id,
         db=db,
     )
+    
+    # Already validated by the service; serialize directly to JSON bytes
+    return Response(
+        content=analytics.model_dump_json(),
+        media_type="application/json",
+    )
@@ -13,6 +13,7 @@ from sqlalchemy.ext.asyncio import AsyncSession
 from sqlalchemy import select
 from sqlalchemy.orm import selectinload
 
+from app.core.cache import bump_playlist_version
 from app.core.database import get_db
 from app.api.deps import get_current_user_optional, get_current_user
 from app.models.user import User
@@ -175,23 +176,22 @@ async def enroll_in_playlist(
             Enrollment.playlist_id == playlist_id,
         )
     )
-    if existing.scalar_one_or_none():
-        return {"message": "Already enrolled", "enrollment_id": existing.scalar_one_or_none().id}
+    existing_enrollment = existing.scalar_one_or_none()
+    if existing_enrollment:
+        return {"message": "Already enrolled", "enrollment_id": existing_enrollment.id}
     
-    # Get first video for enrollment (required by current model)
     if not playlist.videos:
         raise HTTPException(status_code=400, detail="Playlist has no videos")
     
-    first_video = sorted(playlist.videos, key=lambda v: v.id)[0]
-    
     # Create enrollment
     enrollment = Enrollment(
         user_id=current_user.id,
         playlist_id=playlist_id,
-        video_id=first_video.id,
     )
     db.add(enrollment)
     await db.commit()
+    # New student: invalidate cached course analytics
+    bump_playlist_version(playlist_id)
     await db.refresh(enrollment)
     
     return {
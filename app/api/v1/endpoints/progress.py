@@ -5,14 +5,16 @@ Endpoints for student video progress tracking and quiz submissions.
 Used by the Chrome Extension for real-time progress updates.
 """
 
-from typing import Annotated
+from typing import Annotated, Union
 
-from fastapi import APIRouter, Depends
+import orjson
+from fastapi import APIRouter, Depends, Response
 from sqlalchemy.ext.asyncio import AsyncSession
 
 from app.api.deps import get_current_active_user
 from app.core.database import get_db
 from app.models.user import User
+from app.models.video_progress import VideoProgress
 from app.schemas.progress import (
     ProgressStart,
     ProgressUpdate,
@@ -23,11 +25,30 @@ from app.schemas.progress import (
     EnrollmentResponse,
 )
 from app.services import progress_service
+from app.services.watch_time_buffer import ProgressSnapshot
 
 
 router = APIRouter(prefix="/progress", tags=["Progress"])
 
 
+def _progress_json(progress: Union[VideoProgress, ProgressSnapshot]) -> Response:
+    """
+    Serialize progress straight to a JSON response with orjson.
+    
+    Returning a Response skips FastAPI's response_model validation and
+    serialization; the body matches ProgressResponse, which is kept on
+    the routes for the docs.
+    """
+    body = orjson.dumps({
+        "video_id": progress.video_id,
+        "watch_status": progress.watch_status,
+        "seconds_watched": progress.seconds_watched,
+        "is_quiz_passed": progress.is_quiz_passed,
+        "quiz_score": progress.quiz_score,
+    })
+    return Response(content=body, media_type="application/json")
+
+
 @router.get(
     "/enrollments",
     response_model=list[dict],
@@ -86,7 +107,7 @@ async def start_video(
     data: ProgressStart,
     current_user: Annotated[User, Depends(get_current_active_user)],
     db: Annotated[AsyncSession, Depends(get_db)],
-) -> ProgressResponse:
+) -> Response:
     """
     Start watching a video.
     
@@ -110,13 +131,7 @@ async def start_video(
         db=db,
     )
     
-    return ProgressResponse(
-        video_id=progress.video_id,
-        watch_status=progress.watch_status,
-        seconds_watched=progress.seconds_watched,
-        is_quiz_passed=progress.is_quiz_passed,
-        quiz_score=progress.quiz_score,
-    )
+    return _progress_json(progress)
 
 
 @router.post(
@@ -128,7 +143,7 @@ async def heartbeat(
     data: ProgressUpdate,
     current_user: Annotated[User, Depends(get_current_active_user)],
     db: Annotated[AsyncSession, Depends(get_db)],
-) -> ProgressResponse:
+) -> Response:
     """
     Update the watch time for a video (heartbeat).
     
@@ -150,13 +165,7 @@ async def heartbeat(
         db=db,
     )
     
-    return ProgressResponse(
-        video_id=progress.video_id,
-        watch_status=progress.watch_status,
-        seconds_watched=progress.seconds_watched,
-        is_quiz_passed=progress.is_quiz_passed,
-        quiz_score=progress.quiz_score,
-    )
+    return _progress_json(progress)
 
 
 @router.post(
@@ -168,7 +177,7 @@ async def complete_video(
     data: ProgressComplete,
     current_user: Annotated[User, Depends(get_current_active_user)],
     db: Annotated[AsyncSession, Depends(get_db)],
-) -> ProgressResponse:
+) -> Response:
     """
     Mark a video as complete (WATCHED).
     
@@ -191,13 +200,7 @@ async def complete_video(
         db=db,
     )
     
-    return ProgressResponse(
-        video_id=progress.video_id,
-        watch_status=progress.watch_status,
-        seconds_watched=progress.seconds_watched,
-        is_quiz_passed=progress.is_quiz_passed,
-        quiz_score=progress.quiz_score,
-    )
+    return _progress_json(progress)
 
 
 @router.post(
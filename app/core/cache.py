@@ -4,6 +4,8 @@ Caching Module
 Provides in-memory caching with TTL support for:
 - Transcripts (rarely change)
 - Quiz results (prevents redundant AI calls)
+- Course read paths (analytics, analysis status) via versioned keys
+- Course metadata for ownership/existence checks
 
 This is CRITICAL for scalability - without caching, the same video
 analyzed multiple times would trigger multiple expensive AI calls.
@@ -143,39 +145,115 @@ class TTLCache(Generic[T]):
 
 # ============== Global Cache Instances ==============
 
-# Cache for video transcripts (1 hour TTL, transcripts rarely change)
-transcript_cache: TTLCache[Optional[str]] = TTLCache(
+# Cache for video transcripts (7 days TTL, transcripts rarely change)
+transcript_cache: TTLCache[str] = TTLCache(
     max_size=1000,
-    default_ttl=3600  # 1 hour
+    default_ttl=604800  # 7 days
 )
 
+# Tombstone cached for videos with no transcript. Kept short-lived since
+# captions may be added to a video later.
+TRANSCRIPT_UNAVAILABLE = ""
+TRANSCRIPT_UNAVAILABLE_TTL = 3600  # 1 hour
+
 # Cache for quiz results (4 hours TTL, prevent redundant AI calls)
 quiz_cache: TTLCache[Dict[str, Any]] = TTLCache(
     max_size=500,
     default_ttl=14400  # 4 hours
 )
 
+# Cache for per-course read paths (5 minutes TTL, keys are versioned)
+course_stats_cache: TTLCache[Any] = TTLCache(
+    max_size=1000,
+    default_ttl=300  # 5 minutes
+)
+
+# Cache for course metadata used by authorization checks (1 minute TTL,
+# invalidated on course mutation)
+course_metadata_cache: TTLCache[Any] = TTLCache(
+    max_size=1024,
+    default_ttl=60  # 1 minute
+)
+
+# Per-playlist version counters. Bumping a version makes every key built
+# from the old version unreachable, so no key scanning is needed on writes.
+_playlist_versions: Dict[int, int] = {}
+
 
 # ============== Cache Helper Functions ==============
 
 def get_cached_transcript(video_id: str) -> Optional[str]:
-    """Get cached transcript for a video."""
+    """
+    Get cached transcript for a video.
+    
+    Returns None on a cache miss and TRANSCRIPT_UNAVAILABLE if the video
+    is known to have no transcript.
+    """
     return transcript_cache.get(video_id)
 
 
 def cache_transcript(video_id: str, transcript: Optional[str]) -> None:
-    """Cache a transcript for a video."""
-    transcript_cache.set(video_id, transcript)
+    """Cache a transcript for a video (None caches a short-lived tombstone)."""
+    if transcript is None:
+        transcript_cache.set(video_id, TRANSCRIPT_UNAVAILABLE, ttl=TRANSCRIPT_UNAVAILABLE_TTL)
+    else:
+        transcript_cache.set(video_id, transcript)
+
+
+def get_cached_quiz(key: str) -> Optional[Dict[str, Any]]:
+    """Get cached quiz data (keyed by video or transcript hash)."""
+    return quiz_cache.get(key)
+
+
+def cache_quiz(key: str, quiz_data: Dict[str, Any]) -> None:
+    """Cache quiz data (keyed by video or transcript hash)."""
+    quiz_cache.set(key, quiz_data)
+
+
+def get_playlist_version(playlist_id: int) -> int:
+    """Get the current cache version for a playlist."""
+    return _playlist_versions.get(playlist_id, 0)
+
+
+def bump_playlist_version(playlist_id: int) -> None:
+    """Invalidate all cached course read paths for a playlist."""
+    _playlist_versions[playlist_id] = _playlist_versions.get(playlist_id, 0) + 1
+
+
+def course_stats_key(kind: str, playlist_id: int) -> str:
+    """Build a versioned cache key, e.g. 'analytics:12:v3'."""
+    return f"{kind}:{playlist_id}:v{get_playlist_version(playlist_id)}"
+
+
+def get_cached_course_stats(key: str) -> Optional[Any]:
+    """
+    Get a cached course read-path result.
+    
+    Build the key once with course_stats_key() before querying and pass
+    the same key to cache_course_stats(), so a version bump during the
+    query can't file the stale result under the new version.
+    """
+    return course_stats_cache.get(key)
+
+
+def cache_course_stats(key: str, value: Any) -> None:
+    """Cache a course read-path result under a key from course_stats_key()."""
+    course_stats_cache.set(key, value)
+
+
+def get_cached_course_metadata(course_id: int) -> Optional[Any]:
+    """Get cached metadata for a course."""
+    return course_metadata_cache.get(f"course_meta:{course_id}")
 
 
-def get_cached_quiz(video_id: str) -> Optional[Dict[str, Any]]:
-    """Get cached quiz data for a video."""
-    return quiz_cache.get(video_id)
+def cache_course_metadata(course_id: int, metadata: Any) -> None:
+    """Cache metadata for a course."""
+    course_metadata_cache.set(f"course_meta:{course_id}", metadata)
 
 
-def cache_quiz(video_id: str, quiz_data: Dict[str, Any]) -> None:
-    """Cache quiz data for a video."""
-    quiz_cache.set(video_id, quiz_data)
+def invalidate_course_metadata(course_id: int) -> None:
+    """Drop cached metadata after a course is modified."""
+    course_metadata_cache.delete(f"course_meta:{course_id}")
 
 
 def get_cache_stats() -> Dict[str, Any]:
@@ -183,4 +261,6 @@ def get_cache_stats() -> Dict[str, Any]:
     return {
         "transcript_cache": transcript_cache.stats(),
         "quiz_cache": quiz_cache.stats(),
+        "course_stats_cache": course_stats_cache.stats(),
+        "course_metadata_cache": course_metadata_cache.stats(),
     }
@@ -15,6 +15,19 @@ class Settings(BaseSettings):
 
     # Database
     DATABASE_URL: str
+    DB_POOL_SIZE: int = 20
+    DB_MAX_OVERFLOW: int = 40
+    DB_POOL_RECYCLE_SECONDS: int = 1800
+    # asyncpg prepared statement caches (set both to 0 behind pgbouncer
+    # in transaction pooling mode)
+    DB_STATEMENT_CACHE_SIZE: int = 1024
+    DB_PREPARED_STATEMENT_CACHE_SIZE: int = 1024
+    # Turn off Postgres JIT per connection (disable behind pgbouncer
+    # unless "jit" is in its ignore_startup_parameters)
+    DB_DISABLE_JIT: bool = True
+
+    # Certificate PDF rendering (worker processes per app process)
+    PDF_WORKERS: int = 2
 
     # Security
     SECRET_KEY: str
@@ -47,18 +47,36 @@ def get_engine() -> AsyncEngine:
         if "?" in db_url:
             db_url = db_url.split("?")[0]
         
+        # SQLAlchemy's asyncpg dialect reads its prepared statement cache
+        # size from the URL rather than from connect_args
+        db_url = (
+            f"{db_url}?prepared_statement_cache_size="
+            f"{settings.DB_PREPARED_STATEMENT_CACHE_SIZE}"
+        )
+        
         # Create SSL context for NeonDB
         ssl_context = ssl.create_default_context()
         ssl_context.check_hostname = False
         ssl_context.verify_mode = ssl.CERT_NONE
         
+        connect_args = {
+            "ssl": ssl_context,
+            "statement_cache_size": settings.DB_STATEMENT_CACHE_SIZE,
+        }
+        if settings.DB_DISABLE_JIT:
+            # JIT compilation only adds latency to short OLTP statements.
+            # Sent as a startup parameter, which poolers like pgbouncer
+            # reject unless it is in their ignore list.
+            connect_args["server_settings"] = {"jit": "off"}
+        
         _engine = create_async_engine(
             db_url,
             echo=settings.is_development,
             pool_pre_ping=True,
-            pool_size=20,
-            max_overflow=40,
-            connect_args={"ssl": ssl_context},
+            pool_size=settings.DB_POOL_SIZE,
+            max_overflow=settings.DB_MAX_OVERFLOW,
+            pool_recycle=settings.DB_POOL_RECYCLE_SECONDS,
+            connect_args=connect_args,
         )
     return _engine
 
@@ -0,0 +1,56 @@
+"""
+Logging Configuration
+
+Routes application logs through an in-memory queue so request handlers
+never block on stderr writes. A background listener thread performs the
+actual I/O.
+"""
+
+import logging
+import logging.handlers
+import queue
+from typing import Optional
+
+
+LOG_FORMAT = "%(asctime)s %(levelname)s [%(name)s] %(message)s"
+
+_listener: Optional[logging.handlers.QueueListener] = None
+
+
+def setup_logging(level: int = logging.INFO) -> None:
+    """
+    Attach a queue-backed handler to the "app" logger.
+    
+    Should be called during application startup. Safe to call twice.
+    
+    Args:
+        level: Minimum level for application loggers.
+    """
+    global _listener
+    if _listener is not None:
+        return
+    
+    log_queue: queue.SimpleQueue = queue.SimpleQueue()
+    
+    stream_handler = logging.StreamHandler()
+    stream_handler.setFormatter(logging.Formatter(LOG_FORMAT))
+    
+    app_logger = logging.getLogger("app")
+    app_logger.setLevel(level)
+    app_logger.addHandler(logging.handlers.QueueHandler(log_queue))
+    app_logger.propagate = False
+    
+    _listener = logging.handlers.QueueListener(log_queue, stream_handler)
+    _listener.start()
+
+
+def shutdown_logging() -> None:
+    """
+    Flush queued records and stop the listener thread.
+    
+    Should be called during application shutdown.
+    """
+    global _listener
+    if _listener is not None:
+        _listener.stop()
+        _listener = None
@@ -12,6 +12,14 @@ from fastapi.middleware.cors import CORSMiddleware
 
 from app.core.config import settings
 from app.core.database import close_db
+from app.core.http_client import close_http_client
+from app.core.logging_config import setup_logging, shutdown_logging
+from app.services.ai_service import close_ai_clients, init_ai_clients
+from app.services.pdf_service import close_pdf_pool
+from app.services.watch_time_buffer import (
+    start_watch_time_flusher,
+    stop_watch_time_flusher,
+)
 from app.api.v1 import router as api_v1_router
 
 
@@ -23,11 +31,19 @@ async def lifespan(app: FastAPI) -> AsyncGenerator[None, None]:
     Handles startup and shutdown events.
     """
     # Startup
+    setup_logging()
     print("🚀 Starting Credlyse Backend...")
+    await init_ai_clients()
+    start_watch_time_flusher()
     yield
     # Shutdown
     print("🛑 Shutting down Credlyse Backend...")
+    await stop_watch_time_flusher()
+    await close_ai_clients()
+    await close_http_client()
+    close_pdf_pool()
     await close_db()
+    shutdown_logging()
 
 
 # Create FastAPI application
@@ -8,7 +8,7 @@ import uuid
 from datetime import datetime
 from typing import TYPE_CHECKING
 
-from sqlalchemy import DateTime, ForeignKey, Integer, String, func
+from sqlalchemy import DateTime, ForeignKey, Integer, String, UniqueConstraint, func
 from sqlalchemy.dialects.postgresql import UUID
 from sqlalchemy.orm import Mapped, mapped_column, relationship
 
@@ -34,7 +34,11 @@ class Certificate(Base):
     """
     
     __tablename__ = "certificates"
-
+    
+    __table_args__ = (
+        UniqueConstraint("user_id", "playlist_id", name="uq_certificate_user_playlist"),
+    )
+    
     id: Mapped[uuid.UUID] = mapped_column(
         UUID(as_uuid=True),
         primary_key=True,
@@ -59,7 +63,7 @@ class Certificate(Base):
         String(500),
         nullable=False,
     )
-
+    
     # Relationships
     user: Mapped["User"] = relationship(
         "User",
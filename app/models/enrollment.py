@@ -32,6 +32,9 @@ class Enrollment(Base):
         playlist_id: Foreign key to playlists table.
         is_completed: Whether the user has completed the course.
         certificate_url: URL to the generated certificate (if completed).
+        watched_count: Number of videos marked WATCHED (denormalized).
+        quiz_score_sum: Sum of recorded quiz scores (denormalized).
+        quiz_score_count: Number of recorded quiz scores (denormalized).
         last_active_at: Timestamp of last activity in the course.
     """
     
@@ -65,6 +68,24 @@ class Enrollment(Base):
         String(500),
         nullable=True,
     )
+    watched_count: Mapped[int] = mapped_column(
+        Integer,
+        default=0,
+        server_default="0",
+        nullable=False,
+    )
+    quiz_score_sum: Mapped[int] = mapped_column(
+        Integer,
+        default=0,
+        server_default="0",
+        nullable=False,
+    )
+    quiz_score_count: Mapped[int] = mapped_column(
+        Integer,
+        default=0,
+        server_default="0",
+        nullable=False,
+    )
     created_at: Mapped[datetime] = mapped_column(
         DateTime(timezone=True),
         server_default=func.now(),
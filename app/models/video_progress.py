@@ -6,7 +6,7 @@ Granular tracking of user progress within individual videos.
 
 from typing import TYPE_CHECKING, Optional
 
-from sqlalchemy import Boolean, Enum, ForeignKey, Integer
+from sqlalchemy import Boolean, Enum, ForeignKey, Index, Integer
 from sqlalchemy.orm import Mapped, mapped_column, relationship
 
 from app.core.database import Base
@@ -34,6 +34,20 @@ class VideoProgress(Base):
     """
     
     __tablename__ = "video_progress"
+    
+    __table_args__ = (
+        # Per-enrollment aggregation of watch status and quiz scores
+        Index("ix_vp_enroll_status", "enrollment_id", "watch_status"),
+        Index("ix_vp_enroll_quizscore", "enrollment_id", "quiz_score"),
+        # Eligibility JOIN on (enrollment_id, video_id); covering so it can
+        # be answered by an index-only scan
+        Index(
+            "ix_vp_enroll_video",
+            "enrollment_id",
+            "video_id",
+            postgresql_include=["watch_status", "is_quiz_passed", "id"],
+        ),
+    )
 
     id: Mapped[int] = mapped_column(
         Integer,
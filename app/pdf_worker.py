@@ -0,0 +1,163 @@
+"""
+PDF Worker
+
+Certificate rendering, run in the PDF worker processes (see
+app.services.pdf_service.get_pdf_pool). Draws in a single ReportLab pass:
+the template page is parsed once with pdfrw into a form XObject that is
+drawn as the background of every certificate canvas.
+
+Lives outside app.services so spawned workers only import this module
+and the PDF libraries, not the whole service layer.
+"""
+
+from functools import lru_cache
+from io import BytesIO
+from pathlib import Path
+
+
+# Template path
+TEMPLATE_PATH = Path(__file__).parent / "resources" / "certificate.pdf"
+
+
+@lru_cache(maxsize=1)
+def get_template_form():
+    """
+    Parse the (static) certificate template once into a form XObject.
+    
+    The parsed object is only read when drawn, so it is shared by all
+    canvases in the process.
+    """
+    from pdfrw import PdfReader
+    from pdfrw.buildxobj import pagexobj
+    
+    return pagexobj(PdfReader(str(TEMPLATE_PATH)).pages[0])
+
+
+# ==============================================================================
+# COORDINATE CONFIGURATION
+# Adjust these values to calibrate text positions on the template.
+# All values are in points (1 inch = 72 points).
+# Origin (0, 0) is at the BOTTOM-LEFT of the page.
+# Standard A4 Landscape = 842 x 595 points
+# ==============================================================================
+
+# Page dimensions (A4 Landscape)
+# Same as reportlab's landscape(A4); literal so the module imports without
+# loading reportlab (PDF libraries are imported on first use)
+PAGE_WIDTH, PAGE_HEIGHT = 841.8897637795277, 595.2755905511812  # 842 x 595 points
+
+# --- Text Color ---
+# Pure White (#FFFFFF) to match dark certificate background
+TEXT_COLOR_RGB = (1, 1, 1)
+
+# --- Student Name ---
+# Position: Right-of-center, beside "OF COMPLETION OF" label
+STUDENT_NAME_X = 550                  # ADJUST: Right of center (was width/2)
+STUDENT_NAME_Y = 380                  # ADJUST: Move up/down (was 320)
+STUDENT_NAME_FONT = "Helvetica-Bold"
+STUDENT_NAME_SIZE = 30
+
+# --- Course Name ---
+# Position: Centered, on the divider line above "In recognition..." paragraph
+COURSE_NAME_Y = 295                   # ADJUST: Move up/down (was 260)
+COURSE_NAME_FONT = "Helvetica-Bold"
+COURSE_NAME_SIZE = 24
+
+# --- Date ---
+# Position: Centered over the "DATE" line (bottom left)
+DATE_X = 200                          # Centered over left line
+DATE_Y = 160                          # On the line
+DATE_FONT = "Helvetica"
+DATE_SIZE = 12
+
+# --- Presented By ---
+# Position: Centered over the "PRESENTED BY" line (bottom right)
+PRESENTED_BY_X = 640                  # Centered over right line
+PRESENTED_BY_Y = 160                  # On the line
+PRESENTED_BY_FONT = "Helvetica"
+PRESENTED_BY_SIZE = 12
+PRESENTED_BY_TEXT = "Credlyse Team"
+
+# --- Certificate ID ---
+# Position: After "CERTIFICATE ID:" label in footer
+CERT_ID_X = 300                       # ADJUST: After label (moved left from 330)
+CERT_ID_Y = 75                        # ADJUST: Just above underline (moved up from 70)
+CERT_ID_FONT = "Helvetica"
+CERT_ID_SIZE = 12
+
+# ==============================================================================
+
+
+class PdfGenerator:
+    """
+    Service for generating certificate PDFs.
+    
+    Draws the pre-parsed template as a background form XObject and the
+    dynamic text on top of it, writing the final PDF in one pass.
+    """
+    
+    @classmethod
+    def generate_overlay(
+        cls,
+        student_name: str,
+        course_name: str,
+        issue_date: str,
+        short_id: str,
+    ) -> bytes:
+        """
+        Generate a certificate PDF by drawing text over the template.
+        
+        Args:
+            student_name: Full name of the student.
+            course_name: Title of the completed course.
+            issue_date: Formatted date string (e.g., "January 19, 2026").
+            short_id: Short certificate ID shown in the footer (first 8
+                hex characters of the UUID).
+        
+        Returns:
+            The final PDF as bytes.
+        """
+        from pdfrw.toreportlab import makerl
+        from reportlab.pdfgen import canvas
+        
+        template = get_template_form()
+        x0, y0, x1, y1 = (float(v) for v in template.BBox)
+        
+        buffer = BytesIO()
+        # The page keeps the template's own box (its origin is offset), so
+        # text coordinates stay in the template's coordinate space
+        c = canvas.Canvas(
+            buffer,
+            pagesize=(x1 - x0, y1 - y0),
+            pageCompression=1,  # Deflate the content stream
+            invariant=1,  # Deterministic output (no timestamps or random IDs)
+        )
+        c.translate(-x0, -y0)
+        c.doForm(makerl(c, template))
+        width = PAGE_WIDTH
+        
+        # --- Set Pure White Text Color ---
+        c.setFillColorRGB(*TEXT_COLOR_RGB)
+        
+        # --- Student Name (Right-of-Center) ---
+        c.setFont(STUDENT_NAME_FONT, STUDENT_NAME_SIZE)
+        c.drawCentredString(STUDENT_NAME_X, STUDENT_NAME_Y, student_name)
+        
+        # --- Course Name (Centered) ---
+        c.setFont(COURSE_NAME_FONT, COURSE_NAME_SIZE)
+        c.drawCentredString(width / 2, COURSE_NAME_Y, course_name)
+        
+        # --- Date (Centered over left line) ---
+        c.setFont(DATE_FONT, DATE_SIZE)
+        c.drawCentredString(DATE_X, DATE_Y, issue_date)
+        
+        # --- Presented By (Centered over right line) ---
+        c.setFont(PRESENTED_BY_FONT, PRESENTED_BY_SIZE)
+        c.drawCentredString(PRESENTED_BY_X, PRESENTED_BY_Y, PRESENTED_BY_TEXT)
+        
+        # --- Certificate ID (After label in footer) ---
+        c.setFont(CERT_ID_FONT, CERT_ID_SIZE)
+        c.drawString(CERT_ID_X, CERT_ID_Y, short_id)
+        
+        c.save()
+        return buffer.getvalue()
@@ -6,16 +6,45 @@ Handles AI-powered content analysis using OpenAI and Gemini (via LangChain).
 - Fallback: Gemini for direct video analysis when transcript unavailable
 """
 
-import json
-from typing import Optional, Dict, Any
+import asyncio
+import copy
+import hashlib
+import logging
+from functools import lru_cache
+from typing import TYPE_CHECKING, Optional, Dict, Any, List
+
+import httpx
+import orjson
+from openai import AsyncOpenAI, DefaultAsyncHttpxClient
+
+from app.core.cache import (
+    TRANSCRIPT_UNAVAILABLE,
+    cache_quiz,
+    cache_transcript,
+    get_cached_quiz,
+    get_cached_transcript,
+)
+from app.core.config import settings
 
-from openai import AsyncOpenAI
+if TYPE_CHECKING:
+    import requests
+    import tiktoken
+    from langchain_google_genai import ChatGoogleGenerativeAI
+    from youtube_transcript_api import YouTubeTranscriptApi
 
-from app.core.config import settings
+
+logger = logging.getLogger(__name__)
 
 
 # ============== OpenAI Client ==============
 
+# Connection pool for the OpenAI client (HTTP/2 multiplexes concurrent
+# quiz requests over one TLS connection; keep-alive avoids re-handshakes)
+OPENAI_TIMEOUT = 60.0  # seconds
+OPENAI_MAX_KEEPALIVE_CONNECTIONS = 32
+OPENAI_KEEPALIVE_EXPIRY = 60  # seconds
+OPENAI_WARMUP_TIMEOUT = 5.0  # seconds (startup warm-up call, no retries)
+
 _openai_client: Optional[AsyncOpenAI] = None
 
 
@@ -25,10 +54,120 @@ def get_openai_client() -> AsyncOpenAI:
     if _openai_client is None:
         if not settings.OPENAI_API_KEY:
             raise ValueError("OPENAI_API_KEY not configured")
-        _openai_client = AsyncOpenAI(api_key=settings.OPENAI_API_KEY)
+        _openai_client = AsyncOpenAI(
+            api_key=settings.OPENAI_API_KEY,
+            http_client=DefaultAsyncHttpxClient(
+                http2=True,
+                timeout=OPENAI_TIMEOUT,
+                limits=httpx.Limits(
+                    max_keepalive_connections=OPENAI_MAX_KEEPALIVE_CONNECTIONS,
+                    keepalive_expiry=OPENAI_KEEPALIVE_EXPIRY,
+                ),
+            ),
+        )
     return _openai_client
 
 
+# ============== Gemini Model ==============
+
+_gemini_model: Optional["ChatGoogleGenerativeAI"] = None
+
+
+def get_gemini_model() -> "ChatGoogleGenerativeAI":
+    """Get or create the Gemini chat model (via LangChain)."""
+    global _gemini_model
+    if _gemini_model is None:
+        if not settings.GEMINI_API_KEY:
+            raise ValueError("GEMINI_API_KEY not configured")
+        from langchain_google_genai import ChatGoogleGenerativeAI
+        
+        _gemini_model = ChatGoogleGenerativeAI(
+            model="gemini-2.0-flash",
+            google_api_key=settings.GEMINI_API_KEY,
+            temperature=0.7,
+        )
+    return _gemini_model
+
+
+# ============== YouTube Transcript Client ==============
+
+# Shared keep-alive pool for transcript fetches, sized to cover
+# TRANSCRIPT_FETCH_CONCURRENCY worker threads
+TRANSCRIPT_POOL_SIZE = 20
+
+_transcript_session: Optional["requests.Session"] = None
+_transcript_api: Optional["YouTubeTranscriptApi"] = None
+
+
+def get_transcript_api() -> "YouTubeTranscriptApi":
+    """Get or create the YouTube transcript client (shares one requests.Session)."""
+    global _transcript_session, _transcript_api
+    if _transcript_api is None:
+        import requests
+        from requests.adapters import HTTPAdapter
+        from youtube_transcript_api import YouTubeTranscriptApi
+        
+        _transcript_session = requests.Session()
+        _transcript_session.mount(
+            "https://",
+            HTTPAdapter(
+                pool_connections=TRANSCRIPT_POOL_SIZE,
+                pool_maxsize=TRANSCRIPT_POOL_SIZE,
+            ),
+        )
+        _transcript_api = YouTubeTranscriptApi(http_client=_transcript_session)
+    return _transcript_api
+
+
+# ============== Client Lifecycle ==============
+
+async def init_ai_clients() -> None:
+    """
+    Create the AI clients before the app accepts traffic.
+    
+    Should be called during application startup so requests only do an
+    attribute lookup. The OpenAI connection is opened with a cheap call
+    that gives up quickly; failures are logged, not raised, so an
+    unreachable API never holds up startup.
+    """
+    if settings.OPENAI_API_KEY:
+        try:
+            client = get_openai_client()
+            await client.with_options(
+                timeout=OPENAI_WARMUP_TIMEOUT, max_retries=0
+            ).models.list()
+        except Exception as e:
+            logger.warning("OpenAI warm-up failed: %s", e)
+        
+        # Load the tokenizer in the background (may download its BPE
+        # file); not awaited, and get_token_encoding never raises
+        loop = asyncio.get_running_loop()
+        loop.run_in_executor(None, get_token_encoding)
+    
+    if settings.GEMINI_API_KEY:
+        try:
+            get_gemini_model()
+        except Exception as e:
+            logger.warning("Gemini init failed: %s", e)
+
+
+async def close_ai_clients() -> None:
+    """
+    Close the AI clients and their connection pools.
+    
+    Should be called during application shutdown.
+    """
+    global _openai_client, _gemini_model, _transcript_session, _transcript_api
+    if _openai_client is not None:
+        await _openai_client.close()
+        _openai_client = None
+    _gemini_model = None
+    if _transcript_session is not None:
+        _transcript_session.close()
+        _transcript_session = None
+    _transcript_api = None
+
+
 # ============== Transcript Fetching ==============
 
 def fetch_transcript(video_id: str) -> Optional[str]:
@@ -37,41 +176,108 @@ def fetch_transcript(video_id: str) -> Optional[str]:
     
     Args:
         video_id: YouTube video ID (11 characters).
-        
+    
     Returns:
-        Combined transcript text, or None if unavailable.
+        Combined transcript text, or None if the video has no transcript.
+    
+    Raises:
+        Exception: On transient failures (network errors, timeouts,
+            rate limiting), so callers don't mistake them for "no
+            transcript".
     """
+    from youtube_transcript_api import NoTranscriptFound, TranscriptsDisabled
+    
+    ytt_api = get_transcript_api()
+    
     try:
-        from youtube_transcript_api import YouTubeTranscriptApi
-        
-        ytt_api = YouTubeTranscriptApi()
-        
         # Try to fetch with preferred languages first
         try:
             transcript_list = ytt_api.fetch(video_id, languages=['en', 'en-US', 'en-GB', 'hi', 'en-IN'])
-        except Exception:
+        except NoTranscriptFound:
             # If preferred languages fail, try to get any available transcript
-            try:
-                transcript_info = ytt_api.list(video_id)
-                # Get first available transcript
-                first_transcript = next(iter(transcript_info))
-                transcript_list = first_transcript.fetch()
-            except Exception as e:
-                print(f"No transcripts available for {video_id}: {e}")
+            transcript_info = ytt_api.list(video_id)
+            # Get first available transcript
+            first_transcript = next(iter(transcript_info), None)
+            if first_transcript is None:
+                logger.info("No transcripts available for %s", video_id)
                 return None
-        
-        # Combine all segments into text
-        transcript_text = " ".join(segment.text for segment in transcript_list)
-        return transcript_text.strip() if transcript_text.strip() else None
+            transcript_list = first_transcript.fetch()
+    except (NoTranscriptFound, TranscriptsDisabled) as e:
+        logger.info("No transcripts available for %s: %s", video_id, e)
+        return None
+    
+    # Combine all segments into text (a list lets join size the result in one pass)
+    transcript_text = " ".join([segment.text for segment in transcript_list]).strip()
+    return transcript_text or None
+
+
+# Max concurrent transcript fetches (avoid YouTube rate limiting)
+TRANSCRIPT_FETCH_CONCURRENCY = 10
+
+
+async def fetch_transcript_async(video_id: str) -> Optional[str]:
+    """
+    Fetch transcript for a YouTube video without blocking the event loop.
+    
+    The YouTube transcript API is synchronous, so the call is offloaded
+    to the default thread pool executor. Results (including "no
+    transcript") are cached per video ID; transient errors are not, so
+    the next request retries.
+    
+    Args:
+        video_id: YouTube video ID (11 characters).
+    
+    Returns:
+        Combined transcript text, or None if unavailable.
+    """
+    cached = get_cached_transcript(video_id)
+    if cached is not None:
+        return cached if cached != TRANSCRIPT_UNAVAILABLE else None
+    
+    try:
+        loop = asyncio.get_running_loop()
+        transcript = await loop.run_in_executor(None, fetch_transcript, video_id)
     except Exception as e:
-        print(f"Error fetching transcript for {video_id}: {e}")
+        # Transient failure: don't cache a tombstone for it
+        logger.error("Error fetching transcript for %s: %s", video_id, e)
         return None
+    
+    cache_transcript(video_id, transcript)
+    return transcript
+
+
+async def fetch_transcripts_batch(video_ids: List[str]) -> Dict[str, Optional[str]]:
+    """
+    Fetch transcripts for many videos concurrently.
+    
+    Network waits overlap, so wall time is bounded by the slowest
+    fetches rather than the sum of all of them.
+    
+    Args:
+        video_ids: YouTube video IDs.
+    
+    Returns:
+        Dict mapping each video ID to its transcript (or None).
+    """
+    semaphore = asyncio.Semaphore(TRANSCRIPT_FETCH_CONCURRENCY)
+    
+    async def _fetch(video_id: str) -> Optional[str]:
+        async with semaphore:
+            return await fetch_transcript_async(video_id)
+    
+    transcripts = await asyncio.gather(*(_fetch(v) for v in video_ids))
+    return dict(zip(video_ids, transcripts))
 
 
 # ============== Quiz Generation Prompts ==============
 
+@lru_cache(maxsize=32)
 def get_quiz_system_prompt(num_questions: int = 5) -> str:
-    """Generate the quiz system prompt with dynamic question count."""
+    """
+    Generate the quiz system prompt with dynamic question count.
+    
+    Cached per question count, since only a handful of counts are used.
+    """
     return f"""You are an educational AI assistant. Analyze the provided content and:
 
 1. DECIDE: Is this educational content that teaches concepts? 
@@ -108,7 +314,7 @@ def calculate_question_count(duration_seconds: int) -> int:
     
     Args:
         duration_seconds: Video duration in seconds.
-        
+    
     Returns:
         Number of questions to generate.
     """
@@ -132,6 +338,76 @@ def calculate_question_count(duration_seconds: int) -> int:
 
 # ============== OpenAI Quiz Generation ==============
 
+# Request constants shared by every quiz call (never mutated)
+_JSON_RESPONSE_FORMAT = {"type": "json_object"}
+
+
+@lru_cache(maxsize=32)
+def _quiz_system_message(num_questions: int) -> Dict[str, str]:
+    """Get the (cached) system message for a given question count."""
+    return {"role": "system", "content": get_quiz_system_prompt(num_questions)}
+
+
+# Model used for quiz generation (part of the quiz cache key)
+OPENAI_QUIZ_MODEL = "gpt-4o-mini"
+
+
+def _quiz_cache_key(transcript: str, num_questions: int) -> str:
+    """Build a quiz cache key from the transcript content, model and question count."""
+    digest = hashlib.sha256(transcript.encode("utf-8")).hexdigest()[:16]
+    return f"quiz:{digest}:{OPENAI_QUIZ_MODEL}:{num_questions}"
+
+
+# Transcript budget for the quiz prompt
+MAX_TRANSCRIPT_TOKENS = 3000
+MAX_TRANSCRIPT_CHARS = 12000  # Fallback when the tokenizer is unavailable
+
+
+@lru_cache(maxsize=1)
+def get_token_encoding() -> Optional["tiktoken.Encoding"]:
+    """
+    Get the (cached) tokenizer for the quiz model.
+    
+    tiktoken downloads its BPE file on first use, so a failure is cached
+    as None and callers fall back to character-based truncation.
+    """
+    try:
+        import tiktoken
+        
+        return tiktoken.encoding_for_model(OPENAI_QUIZ_MODEL)
+    except Exception as e:
+        logger.warning("Tokenizer unavailable, truncating by characters: %s", e)
+        return None
+
+
+def truncate_transcript(transcript: str) -> str:
+    """
+    Truncate a transcript to the quiz prompt's token budget.
+    
+    Args:
+        transcript: The video transcript text.
+    
+    Returns:
+        The transcript unchanged if it fits, otherwise its first
+        MAX_TRANSCRIPT_TOKENS tokens followed by a truncation marker.
+    """
+    encoding = get_token_encoding()
+    if encoding is None:
+        if len(transcript) > MAX_TRANSCRIPT_CHARS:
+            return transcript[:MAX_TRANSCRIPT_CHARS] + "... [truncated]"
+        return transcript
+    
+    tokens = encoding.encode(transcript, disallowed_special=())
+    if len(tokens) <= MAX_TRANSCRIPT_TOKENS:
+        return transcript
+    return encoding.decode(tokens[:MAX_TRANSCRIPT_TOKENS]) + "... [truncated]"
+
+
+# Max concurrent in-flight OpenAI requests across all analyses
+OPENAI_CONCURRENCY = 8
+_openai_semaphore = asyncio.Semaphore(OPENAI_CONCURRENCY)
+
+
 async def generate_quiz_with_openai(transcript: str, num_questions: int = 5) -> Dict[str, Any]:
     """
     Generate quiz from transcript using OpenAI.
@@ -139,46 +415,97 @@ async def generate_quiz_with_openai(transcript: str, num_questions: int = 5) ->
     Args:
         transcript: The video transcript text.
         num_questions: Number of questions to generate.
-        
+    
     Returns:
         Dict containing has_quiz, reason, and questions.
     """
     client = get_openai_client()
     
     # Truncate if too long
-    max_chars = 12000
-    if len(transcript) > max_chars:
-        transcript = transcript[:max_chars] + "... [truncated]"
+    transcript = truncate_transcript(transcript)
+    
+    # Identical transcript + model + question count yields a reusable quiz
+    cache_key = _quiz_cache_key(transcript, num_questions)
+    cached_quiz = get_cached_quiz(cache_key)
+    if cached_quiz is not None:
+        # Deep copy: callers may modify the nested questions
+        return copy.deepcopy(cached_quiz)
     
     try:
-        response = await client.chat.completions.create(
-            model="gpt-4o-mini",
-            messages=[
-                {"role": "system", "content": get_quiz_system_prompt(num_questions)},
-                {"role": "user", "content": f"Analyze this transcript:\n\n{transcript}"}
-            ],
-            response_format={"type": "json_object"},
-            temperature=0.7,
-            max_tokens=2000 + (num_questions * 200),  # Scale tokens with question count
-        )
+        async with _openai_semaphore:
+            response = await client.chat.completions.create(
+                model=OPENAI_QUIZ_MODEL,
+                messages=[
+                    _quiz_system_message(num_questions),
+                    {"role": "user", "content": f"Analyze this transcript:\n\n{transcript}"}
+                ],
+                response_format=_JSON_RESPONSE_FORMAT,
+                temperature=0.7,
+                max_tokens=2000 + (num_questions * 200),  # Scale tokens with question count
+            )
         
         content = response.choices[0].message.content
-        quiz_data = json.loads(content)
+        quiz_data = orjson.loads(content)
         
         # Validate structure
         quiz_data.setdefault("has_quiz", False)
         quiz_data.setdefault("reason", "Unknown")
         quiz_data.setdefault("questions", [])
         
-        return quiz_data
+        cache_quiz(cache_key, copy.deepcopy(quiz_data))
         
+        return quiz_data
+    
     except Exception as e:
-        print(f"OpenAI API error: {e}")
+        logger.error("OpenAI API error: %s", e)
         raise
 
 
 # ============== Gemini Fallback (via LangChain) ==============
 
+def _find_json_object(text: str) -> Optional[str]:
+    """
+    Extract the first balanced JSON object from free-form model output.
+    
+    Single linear scan that tracks brace depth and skips braces inside
+    JSON strings, so surrounding prose or code fences are ignored.
+    
+    Args:
+        text: Raw model response text.
+    
+    Returns:
+        The substring spanning the first complete {...} object, or None.
+    """
+    start = text.find("{")
+    if start == -1:
+        return None
+    
+    depth = 0
+    in_string = False
+    escaped = False
+    
+    for i in range(start, len(text)):
+        char = text[i]
+        
+        if in_string:
+            if escaped:
+                escaped = False
+            elif char == "\\":
+                escaped = True
+            elif char == '"':
+                in_string = False
+        elif char == '"':
+            in_string = True
+        elif char == "{":
+            depth += 1
+        elif char == "}":
+            depth -= 1
+            if depth == 0:
+                return text[start:i + 1]
+    
+    return None
+
+
 async def generate_quiz_with_gemini(video_id: str, video_title: str, num_questions: int = 5) -> Dict[str, Any]:
     """
     Generate quiz using Gemini by analyzing the YouTube video directly.
@@ -188,12 +515,12 @@ async def generate_quiz_with_gemini(video_id: str, video_title: str, num_questio
         video_id: YouTube video ID.
         video_title: Title of the video.
         num_questions: Number of questions to generate.
-        
+    
     Returns:
         Dict containing has_quiz, reason, and questions.
     """
     if not settings.GEMINI_API_KEY:
-        print("GEMINI_API_KEY not configured, skipping fallback")
+        logger.warning("GEMINI_API_KEY not configured, skipping fallback")
         return {
             "has_quiz": False,
             "reason": "Transcript unavailable and Gemini fallback not configured",
@@ -201,15 +528,9 @@ async def generate_quiz_with_gemini(video_id: str, video_title: str, num_questio
         }
     
     try:
-        from langchain_google_genai import ChatGoogleGenerativeAI
         from langchain_core.messages import HumanMessage
         
-        # Initialize Gemini model via LangChain
-        model = ChatGoogleGenerativeAI(
-            model="gemini-2.0-flash",
-            google_api_key=settings.GEMINI_API_KEY,
-            temperature=0.7,
-        )
+        model = get_gemini_model()
         
         youtube_url = f"https://www.youtube.com/watch?v={video_id}"
         
@@ -242,14 +563,10 @@ Watch/analyze the video and respond with the JSON format specified."""
         # Try to extract JSON from response
         try:
             # Look for JSON in the response
-            import re
-            json_match = re.search(r'\{[\s\S]*\}', response_text)
-            if json_match:
-                quiz_data = json.loads(json_match.group())
-            else:
-                quiz_data = json.loads(response_text)
-        except json.JSONDecodeError:
-            print(f"Failed to parse Gemini response: {response_text[:200]}")
+            json_text = _find_json_object(response_text)
+            quiz_data = orjson.loads(json_text if json_text is not None else response_text)
+        except orjson.JSONDecodeError:
+            logger.warning("Failed to parse Gemini response: %s", response_text[:200])
             quiz_data = {
                 "has_quiz": False,
                 "reason": "Failed to parse AI response",
@@ -261,9 +578,9 @@ Watch/analyze the video and respond with the JSON format specified."""
         quiz_data.setdefault("questions", [])
         
         return quiz_data
-        
+    
     except Exception as e:
-        print(f"Gemini API error: {e}")
+        logger.error("Gemini API error: %s", e)
         return {
             "has_quiz": False,
             "reason": f"Gemini analysis failed: {str(e)}",
@@ -273,7 +590,13 @@ Watch/analyze the video and respond with the JSON format specified."""
 
 # ============== Main Analysis Pipeline ==============
 
-async def analyze_video_content(video_id: str, video_title: str = "", duration_seconds: int = 0) -> Dict[str, Any]:
+async def analyze_video_content(
+    video_id: str,
+    video_title: str = "",
+    duration_seconds: int = 0,
+    transcript: Optional[str] = None,
+    fetch_missing_transcript: bool = True,
+) -> Dict[str, Any]:
     """
     Full pipeline: fetch transcript and generate quiz.
     Falls back to Gemini if transcript unavailable.
@@ -282,7 +605,10 @@ async def analyze_video_content(video_id: str, video_title: str = "", duration_s
         video_id: YouTube video ID.
         video_title: Title of the video (for Gemini fallback).
         duration_seconds: Video duration in seconds (for dynamic question count).
-        
+        transcript: Pre-fetched transcript (e.g. from fetch_transcripts_batch).
+        fetch_missing_transcript: Fetch the transcript if none was passed.
+            Set to False when the caller already tried and got None.
+    
     Returns:
         Dict with transcript, has_quiz, quiz_data, and success status.
     """
@@ -300,7 +626,8 @@ async def analyze_video_content(video_id: str, video_title: str = "", duration_s
     }
     
     # Step 1: Try to fetch transcript
-    transcript = fetch_transcript(video_id)
+    if transcript is None and fetch_missing_transcript:
+        transcript = await fetch_transcript_async(video_id)
     
     if transcript:
         # Step 2a: Use OpenAI with transcript (preferred method)
@@ -332,3 +659,34 @@ async def analyze_video_content(video_id: str, video_title: str = "", duration_s
             result["error"] = f"Gemini analysis failed: {str(e)}"
     
     return result
+
+
+# Max concurrent per-video analyses in a batch (OpenAI or Gemini)
+ANALYSIS_CONCURRENCY = 8
+
+
+async def analyze_videos_batch(videos: List[Dict[str, Any]]) -> List[Any]:
+    """
+    Run analyze_video_content for many videos concurrently.
+    
+    At most ANALYSIS_CONCURRENCY analyses run at once, which also bounds
+    Gemini fallbacks; OpenAI requests are additionally limited by the
+    module-level OpenAI semaphore.
+    
+    Args:
+        videos: Keyword arguments for analyze_video_content, one dict per video.
+    
+    Returns:
+        Results in the same order as `videos`. A video whose analysis raised
+        has the exception in its slot instead of a result dict.
+    """
+    semaphore = asyncio.Semaphore(ANALYSIS_CONCURRENCY)
+    
+    async def _one(video: Dict[str, Any]) -> Dict[str, Any]:
+        async with semaphore:
+            return await analyze_video_content(**video)
+    
+    return await asyncio.gather(
+        *(_one(video) for video in videos),
+        return_exceptions=True,
+    )
@@ -7,18 +7,20 @@ Business logic for creator analytics and reporting.
 from typing import List
 
 from fastapi import HTTPException, status
+from pydantic import TypeAdapter
 from sqlalchemy import select, func
 from sqlalchemy.ext.asyncio import AsyncSession
-from sqlalchemy.orm import selectinload
 
+from app.core.cache import cache_course_stats, course_stats_key, get_cached_course_stats
 from app.models.user import User
 from app.models.playlist import Playlist
 from app.models.enrollment import Enrollment
-from app.models.video_progress import VideoProgress
-from app.models.enums import WatchStatus
 from app.schemas.analytics import StudentAnalyticsRow
 
 
+_ROW_ADAPTER = TypeAdapter(List[StudentAnalyticsRow])
+
+
 async def get_course_analytics(
     creator_id: str,  # UUID as string or object
     playlist_id: int,
@@ -40,10 +42,13 @@ async def get_course_analytics(
         HTTPException: 404 if course not found.
     """
     # 1. Verify course ownership
+    # Project only the needed columns; Playlist's selectin relationships
+    # would otherwise load every video and enrollment.
     result = await db.execute(
-        select(Playlist).where(Playlist.id == playlist_id)
+        select(Playlist.creator_id, Playlist.total_videos)
+        .where(Playlist.id == playlist_id)
     )
-    playlist = result.scalar_one_or_none()
+    playlist = result.one_or_none()
     
     if not playlist:
         raise HTTPException(
@@ -57,64 +62,76 @@ async def get_course_analytics(
             detail="You can only view analytics for your own courses",
         )
     
-    # 2. Fetch enrollments with related data
-    # Eager load user and video_progress to avoid N+1 queries
-    enrollments_result = await db.execute(
-        select(Enrollment)
-        .where(Enrollment.playlist_id == playlist_id)
-        .options(
-            selectinload(Enrollment.user),
-            selectinload(Enrollment.video_progress)
+    # Key taken before the query: a write that commits meanwhile bumps
+    # the version, so this result is filed under the old one
+    cache_key = course_stats_key("analytics", playlist_id)
+    cached = get_cached_course_stats(cache_key)
+    if cached is not None:
+        return cached
+    
+    # 2. Fetch per-student progress counters
+    # watched_count and quiz score totals are maintained on Enrollment by
+    # progress_service, so no VideoProgress rows need to be read here.
+    rows_result = await db.execute(
+        select(
+            User.full_name,
+            User.email,
+            Enrollment.created_at,
+            Enrollment.is_completed,
+            Enrollment.watched_count,
+            Enrollment.quiz_score_sum,
+            Enrollment.quiz_score_count,
         )
+        .select_from(Enrollment)
+        .join(User, User.id == Enrollment.user_id)
+        .where(Enrollment.playlist_id == playlist_id)
     )
-    enrollments = list(enrollments_result.scalars().all())
     
     analytics_data = []
     total_videos = playlist.total_videos or 1  # Avoid division by zero
     
-    for enrollment in enrollments:
+    for row in rows_result.all():
         # Calculate completion percentage
-        watched_count = sum(
-            1 for p in enrollment.video_progress 
-            if p.watch_status == WatchStatus.WATCHED
-        )
-        completion_pct = (watched_count / total_videos) * 100
+        completion_pct = (row.watched_count / total_videos) * 100
         completion_pct = min(completion_pct, 100.0)  # Cap at 100%
         
         # Calculate average quiz score
-        quiz_scores = [
-            p.quiz_score for p in enrollment.video_progress 
-            if p.quiz_score is not None
-        ]
-        avg_score = sum(quiz_scores) / len(quiz_scores) if quiz_scores else None
-        
-        row = StudentAnalyticsRow(
-            student_name=enrollment.user.full_name,
-            user_email=enrollment.user.email,
-            enrolled_at=enrollment.created_at,
-            completion_percentage=round(completion_pct, 1),
-            average_quiz_score=round(avg_score, 1) if avg_score is not None else None,
-            certificate_issued=enrollment.is_completed,
+        avg_score = (
+            row.quiz_score_sum / row.quiz_score_count
+            if row.quiz_score_count else None
         )
-        analytics_data.append(row)
+        
+        analytics_data.append({
+            "student_name": row.full_name,
+            "user_email": row.email,
+            "enrolled_at": row.created_at,
+            "completion_percentage": round(completion_pct, 1),
+            "average_quiz_score": round(avg_score, 1) if avg_score is not None else None,
+            "certificate_issued": row.is_completed,
+        })
     
     # Calculate global stats
     total_enrollments = len(analytics_data)
     
     avg_completion = 0.0
     if total_enrollments > 0:
-        avg_completion = sum(r.completion_percentage for r in analytics_data) / total_enrollments
+        avg_completion = sum(r["completion_percentage"] for r in analytics_data) / total_enrollments
         
     avg_quiz_score = 0.0
-    valid_quiz_scores = [r.average_quiz_score for r in analytics_data if r.average_quiz_score is not None]
+    valid_quiz_scores = [r["average_quiz_score"] for r in analytics_data if r["average_quiz_score"] is not None]
     if valid_quiz_scores:
         avg_quiz_score = sum(valid_quiz_scores) / len(valid_quiz_scores)
     
     # Return aggregated response matching frontend expectation
     from app.schemas.analytics import CourseAnalyticsResponse
-    return CourseAnalyticsResponse(
+    response = CourseAnalyticsResponse(
         total_enrollments=total_enrollments,
         completion_rate=round(avg_completion, 1),
         average_quiz_score=round(avg_quiz_score, 1),
-        enrollments=analytics_data
+        # Validate all rows in one batched call
+        enrollments=_ROW_ADAPTER.validate_python(analytics_data),
     )
+    
+    cache_course_stats(cache_key, response)
+    
+    return response
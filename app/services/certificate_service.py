@@ -4,16 +4,20 @@ Certificate Service
 Handles certificate eligibility checking and PDF generation.
 """
 
+import asyncio
 import os
 import uuid
-from datetime import datetime
+from datetime import date
+from functools import lru_cache, partial
 from typing import Tuple, List, Optional
 
 from fastapi import HTTPException, status
-from fastapi.concurrency import run_in_threadpool
-from sqlalchemy import select, func
+from sqlalchemy import and_, select, func
+from sqlalchemy.dialects.postgresql import insert as pg_insert
 from sqlalchemy.ext.asyncio import AsyncSession
+from sqlalchemy.orm import load_only, raiseload
 
+from app.core.cache import bump_playlist_version
 from app.models.user import User
 from app.models.playlist import Playlist
 from app.models.video import Video
@@ -21,118 +25,76 @@ from app.models.enrollment import Enrollment
 from app.models.video_progress import VideoProgress
 from app.models.certificate import Certificate
 from app.models.enums import WatchStatus
-from app.services.pdf_service import PdfGenerator
+from app.pdf_worker import PdfGenerator
+from app.services.pdf_service import get_pdf_pool
 from app.services.storage_service import CloudinaryService
 
 
 async def check_eligibility(
-    user_id: uuid.UUID,
-    playlist_id: int,
+    enrollment: Enrollment,
     db: AsyncSession,
 ) -> Tuple[bool, List[str]]:
     """
-    Check if a user is eligible for a certificate in a course.
+    Check if an enrolled user is eligible for a certificate in a course.
     
-    Strict Criteria:
-    1. User must be enrolled.
-    2. User must have a progress record for EVERY video.
-    3. Every video must be WATCHED.
-    4. Every video must have is_quiz_passed=True.
+    Strict Criteria (enrollment is checked by the caller):
+    1. User must have a progress record for EVERY video.
+    2. Every video must be WATCHED.
+    3. Every video must have is_quiz_passed=True.
     
     Args:
-        user_id: User ID.
-        playlist_id: Playlist ID.
+        enrollment: The user's enrollment in the course.
         db: Database session.
-        
+    
     Returns:
         Tuple of (is_eligible, list_of_missing_requirements).
     """
-    # 1. Fetch Enrollment
-    enrollment_result = await db.execute(
-        select(Enrollment).where(
-            Enrollment.user_id == user_id,
-            Enrollment.playlist_id == playlist_id,
+    # One round trip: every video in the playlist, LEFT JOINed to this
+    # user's progress record for it (NULLs when not started)
+    rows = (await db.execute(
+        select(
+            Video.id,
+            Video.title,
+            VideoProgress.watch_status,
+            VideoProgress.is_quiz_passed,
+            VideoProgress.id.label("progress_id"),
         )
-    )
-    enrollment = enrollment_result.scalar_one_or_none()
-    
-    if not enrollment:
-        return False, ["User is not enrolled in this course"]
-    
-    # 2. Fetch all videos in the playlist
-    videos_result = await db.execute(
-        select(Video).where(Video.playlist_id == playlist_id)
-    )
-    videos = list(videos_result.scalars().all())
+        .outerjoin(
+            VideoProgress,
+            and_(
+                VideoProgress.video_id == Video.id,
+                VideoProgress.enrollment_id == enrollment.id,
+            ),
+        )
+        .where(Video.playlist_id == enrollment.playlist_id)
+    )).all()
     
-    if not videos:
+    if not rows:
         return False, ["Course has no videos"]
     
-    # 3. Fetch all progress records for this enrollment
-    progress_result = await db.execute(
-        select(VideoProgress).where(VideoProgress.enrollment_id == enrollment.id)
-    )
-    progress_records = list(progress_result.scalars().all())
-    
-    # Map video_id to progress record
-    progress_map = {p.video_id: p for p in progress_records}
-    
     missing = []
     
-    for video in videos:
-        progress = progress_map.get(video.id)
-        
-        if not progress:
-            missing.append(f"Video '{video.title}' not started")
+    for video_id, title, watch_status, is_quiz_passed, progress_id in rows:
+        if progress_id is None:
+            missing.append(f"Video '{title}' not started")
             continue
-            
-        if progress.watch_status != WatchStatus.WATCHED:
-            missing.append(f"Video '{video.title}' not fully watched")
-            
-        if not progress.is_quiz_passed:
-            missing.append(f"Video '{video.title}' quiz not passed")
-            
+        
+        if watch_status != WatchStatus.WATCHED:
+            missing.append(f"Video '{title}' not fully watched")
+        
+        if not is_quiz_passed:
+            missing.append(f"Video '{title}' quiz not passed")
+    
     if missing:
         return False, missing
-        
+    
     return True, []
 
 
-def _generate_and_upload_certificate(
-    cert_id: str,
-    user_name: str,
-    course_title: str,
-    issue_date: str,
-) -> str:
-    """
-    Blocking function to generate PDF and upload to Cloudinary.
-    
-    This function is meant to be run in a thread pool.
-    
-    Args:
-        cert_id: Unique certificate ID (UUID string).
-        user_name: Name of the student.
-        course_title: Title of the course.
-        issue_date: Formatted date string.
-        
-    Returns:
-        Cloudinary secure_url of the uploaded certificate.
-    """
-    # Step 1: Generate PDF with template overlay
-    pdf_bytes = PdfGenerator.generate_overlay(
-        student_name=user_name,
-        course_name=course_title,
-        issue_date=issue_date,
-        cert_id=cert_id,
-    )
-    
-    # Step 2: Upload to Cloudinary
-    secure_url = CloudinaryService.upload_pdf(
-        pdf_bytes=pdf_bytes,
-        certificate_id=cert_id,
-    )
-    
-    return secure_url
+@lru_cache(maxsize=32)
+def format_issue_date(issued_on: date) -> str:
+    """Format a certificate issue date (e.g., "January 19, 2026")."""
+    return issued_on.strftime("%B %d, %Y")
 
 
 async def generate_certificate_pdf(
@@ -143,32 +105,61 @@ async def generate_certificate_pdf(
     """
     Generate a PDF certificate using template overlay and upload to Cloudinary.
     
-    Uses run_in_threadpool to avoid blocking the async event loop.
+    PDF generation is CPU-bound and runs in the PDF worker process pool;
+    the upload is awaited on the event loop.
     
     Args:
         certificate: Certificate model instance.
         user_name: Name of the student.
         course_title: Title of the course.
-        
+    
     Returns:
         Cloudinary secure_url of the uploaded PDF.
     """
     # Format the issue date
-    issue_date = certificate.issued_at.strftime("%B %d, %Y")
+    issue_date = format_issue_date(certificate.issued_at.date())
     cert_id = str(certificate.id)
+    # Show first 8 characters of UUID for brevity
+    short_id = certificate.id.hex[:8]
+    
+    # Step 1: Generate PDF with template overlay (in a worker process)
+    loop = asyncio.get_running_loop()
+    pdf_bytes = await loop.run_in_executor(
+        get_pdf_pool(),
+        partial(
+            PdfGenerator.generate_overlay,
+            student_name=user_name,
+            course_name=course_title,
+            issue_date=issue_date,
+            short_id=short_id,
+        ),
+    )
     
-    # Run blocking operations in threadpool
-    secure_url = await run_in_threadpool(
-        _generate_and_upload_certificate,
-        cert_id,
-        user_name,
-        course_title,
-        issue_date,
+    # Step 2: Upload to Cloudinary
+    secure_url = await CloudinaryService.upload_pdf(
+        pdf_bytes=pdf_bytes,
+        certificate_id=cert_id,
     )
     
     return secure_url
 
 
+async def _get_issued_certificate(
+    user_id: uuid.UUID,
+    playlist_id: int,
+    db: AsyncSession,
+) -> Optional[Certificate]:
+    """Load a user's certificate for a course (only the columns the claim returns)."""
+    return await db.scalar(
+        select(Certificate)
+        .where(
+            Certificate.user_id == user_id,
+            Certificate.playlist_id == playlist_id,
+        )
+        .options(load_only(Certificate.id, Certificate.pdf_url, Certificate.issued_at))
+    )
+
+
 async def issue_certificate(
     user: User,
     playlist_id: int,
@@ -180,7 +171,7 @@ async def issue_certificate(
     Flow:
     1. Check if certificate already exists (idempotency).
     2. Check eligibility (strict).
-    3. Create Certificate record.
+    3. Reserve Certificate record (INSERT ... ON CONFLICT DO NOTHING).
     4. Generate PDF.
     5. Update Enrollment status.
     
@@ -188,27 +179,38 @@ async def issue_certificate(
         user: Student user.
         playlist_id: Course ID.
         db: Database session.
-        
+    
     Returns:
         Certificate object.
-        
+    
     Raises:
         HTTPException: 400 if not eligible.
     """
     # 1. Check existing certificate
-    result = await db.execute(
-        select(Certificate).where(
-            Certificate.user_id == user.id,
-            Certificate.playlist_id == playlist_id,
-        )
-    )
-    existing_cert = result.scalar_one_or_none()
+    existing_cert = await _get_issued_certificate(user.id, playlist_id, db)
     
     if existing_cert:
         return existing_cert
     
+    # Fetch enrollment and playlist title together (AsyncSession can't run
+    # statements concurrently, so one JOIN replaces separate lookups)
+    enrollment_row = (await db.execute(
+        select(Enrollment, Playlist.title)
+        .join(Playlist, Playlist.id == Enrollment.playlist_id)
+        .where(
+            Enrollment.user_id == user.id,
+            Enrollment.playlist_id == playlist_id,
+        )
+        # Progress is checked by check_eligibility; skip the selectin load
+        .options(raiseload(Enrollment.video_progress))
+    )).one_or_none()
+    
     # 2. Check eligibility
-    is_eligible, missing = await check_eligibility(user.id, playlist_id, db)
+    if enrollment_row is None:
+        is_eligible, missing = False, ["User is not enrolled in this course"]
+    else:
+        enrollment, course_title = enrollment_row
+        is_eligible, missing = await check_eligibility(enrollment, db)
     
     if not is_eligible:
         raise HTTPException(
@@ -219,39 +221,40 @@ async def issue_certificate(
             }
         )
     
-    # Fetch playlist for title
-    playlist_result = await db.execute(
-        select(Playlist).where(Playlist.id == playlist_id)
-    )
-    playlist = playlist_result.scalar_one_or_none()
-    
-    # 3. Create Certificate record
-    certificate = Certificate(
-        id=uuid.uuid4(),
-        user_id=user.id,
-        playlist_id=playlist_id,
-        issued_at=datetime.utcnow(),
+    # 3. Reserve the Certificate record before doing any PDF work. A
+    # concurrent claim for the same course blocks on this uncommitted row
+    # and then returns the committed certificate instead of rendering its
+    # own. pdf_url is filled in once the upload succeeds.
+    certificate = await db.scalar(
+        pg_insert(Certificate)
+        .values(
+            id=uuid.uuid4(),
+            user_id=user.id,
+            playlist_id=playlist_id,
+            pdf_url="",
+        )
+        .on_conflict_do_nothing(
+            index_elements=[Certificate.user_id, Certificate.playlist_id]
+        )
+        .returning(Certificate)
     )
-    db.add(certificate)
+    
+    if certificate is None:
+        return await _get_issued_certificate(user.id, playlist_id, db)
     
     # 4. Generate PDF and upload to Cloudinary
-    pdf_url = await generate_certificate_pdf(certificate, user.full_name, playlist.title)
+    pdf_url = await generate_certificate_pdf(certificate, user.full_name, course_title)
     certificate.pdf_url = pdf_url
     
     # 5. Update Enrollment
-    enrollment_result = await db.execute(
-        select(Enrollment).where(
-            Enrollment.user_id == user.id,
-            Enrollment.playlist_id == playlist_id,
-        )
-    )
-    enrollment = enrollment_result.scalar_one()
     enrollment.is_completed = True
     enrollment.certificate_url = pdf_url
     
     await db.commit()
-    await db.refresh(certificate)
+    bump_playlist_version(playlist_id)
     
+    # No refresh: the reserving INSERT returned every column and the
+    # session doesn't expire objects on commit
     return certificate
 
 
@@ -265,22 +268,21 @@ async def get_certificate(
     Args:
         certificate_id: UUID.
         db: Database session.
-        
+    
     Returns:
         Certificate object.
-        
+    
     Raises:
         HTTPException: 404 if not found.
     """
-    result = await db.execute(
+    certificate = await db.scalar(
         select(Certificate).where(Certificate.id == certificate_id)
     )
-    certificate = result.scalar_one_or_none()
     
     if not certificate:
         raise HTTPException(
             status_code=status.HTTP_404_NOT_FOUND,
             detail="Certificate not found",
         )
-        
+    
     return certificate
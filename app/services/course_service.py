@@ -6,6 +6,7 @@ Business logic for course/playlist management with YouTube API integration.
 
 import re
 import uuid
+from dataclasses import dataclass
 from typing import Tuple, List, Dict, Any, Optional
 
 import httpx
@@ -13,6 +14,11 @@ from fastapi import HTTPException, status
 from sqlalchemy import select, func
 from sqlalchemy.ext.asyncio import AsyncSession
 
+from app.core.cache import (
+    cache_course_metadata,
+    get_cached_course_metadata,
+    invalidate_course_metadata,
+)
 from app.core.config import settings
 from app.models.user import User
 from app.models.playlist import Playlist
@@ -472,6 +478,56 @@ async def get_course_by_id(
     return playlist
 
 
+@dataclass(frozen=True, slots=True)
+class CourseMetadata:
+    """Lightweight course fields needed for existence and ownership checks."""
+    id: int
+    creator_id: uuid.UUID
+    is_published: bool
+
+
+async def get_course_metadata_cached(
+    course_id: int,
+    db: AsyncSession,
+) -> CourseMetadata:
+    """
+    Get course metadata, served from a short-lived per-process cache.
+    
+    Only selects the needed columns, so the Playlist relationships are
+    never loaded. Use get_course_by_id when the full object is needed.
+    
+    Args:
+        course_id: Playlist ID.
+        db: Database session (used on a cache miss).
+        
+    Returns:
+        CourseMetadata for the course.
+        
+    Raises:
+        HTTPException: 404 if course not found.
+    """
+    cached = get_cached_course_metadata(course_id)
+    if cached is not None:
+        return cached
+    
+    result = await db.execute(
+        select(Playlist.id, Playlist.creator_id, Playlist.is_published)
+        .where(Playlist.id == course_id)
+    )
+    row = result.one_or_none()
+    
+    if not row:
+        raise HTTPException(
+            status_code=status.HTTP_404_NOT_FOUND,
+            detail="Course not found",
+        )
+    
+    metadata = CourseMetadata(*row)
+    cache_course_metadata(course_id, metadata)
+    
+    return metadata
+
+
 async def publish_course(
     course_id: int,
     user: User,
@@ -501,6 +557,7 @@ async def publish_course(
     
     playlist.is_published = True
     await db.commit()
+    invalidate_course_metadata(course_id)
     await db.refresh(playlist)
     
     return playlist
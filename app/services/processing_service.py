@@ -4,17 +4,32 @@ Processing Service
 Handles background processing of course content analysis.
 """
 
-from typing import List
+from typing import Any, Dict, List
 
-from sqlalchemy import select
+from sqlalchemy import func, select, update
 from sqlalchemy.ext.asyncio import AsyncSession
 
+from app.core.cache import (
+    bump_playlist_version,
+    cache_course_stats,
+    course_stats_key,
+    get_cached_course_stats,
+)
 from app.models.playlist import Playlist
 from app.models.video import Video
 from app.models.enums import AnalysisStatus
 from app.services import ai_service
 
 
+def _failed_update(video_id: int) -> Dict[str, Any]:
+    """Build the bulk-update row marking a video FAILED with no quiz data."""
+    return {
+        "id": video_id,
+        "quiz_data": None,
+        "analysis_status": AnalysisStatus.FAILED,
+    }
+
+
 async def process_course_content(
     playlist_id: int,
     db: AsyncSession,
@@ -24,12 +39,12 @@ async def process_course_content(
     
     Flow:
     1. Fetch all videos with analysis_status="PENDING"
-    2. For each video:
-       - Fetch transcript from YouTube
+    2. Fetch transcripts for all pending videos concurrently
+    3. Analyze all videos concurrently (OpenAI, or Gemini fallback)
+    4. For each video:
        - If failed, mark as FAILED
-       - If success, call OpenAI for quiz generation
-       - Update video record with results
-    3. Commit changes to database
+       - If success, update video record with results
+    5. Commit changes to database
     
     Args:
         playlist_id: The playlist/course ID to process.
@@ -38,13 +53,12 @@ async def process_course_content(
     Returns:
         Dict with processing results summary.
     """
-    # Fetch playlist to verify it exists
-    playlist_result = await db.execute(
-        select(Playlist).where(Playlist.id == playlist_id)
+    # Fetch playlist title to verify it exists (no relationship loading)
+    playlist_title = await db.scalar(
+        select(Playlist.title).where(Playlist.id == playlist_id)
     )
-    playlist = playlist_result.scalar_one_or_none()
     
-    if not playlist:
+    if playlist_title is None:
         return {
             "success": False,
             "error": "Playlist not found",
@@ -52,14 +66,19 @@ async def process_course_content(
             "failed": 0,
         }
     
-    # Fetch all pending videos
+    # Fetch only the columns needed to analyze each pending video
     videos_result = await db.execute(
-        select(Video).where(
+        select(
+            Video.id,
+            Video.youtube_video_id,
+            Video.title,
+            Video.duration_seconds,
+        ).where(
             Video.playlist_id == playlist_id,
             Video.analysis_status == AnalysisStatus.PENDING,
         )
     )
-    pending_videos: List[Video] = list(videos_result.scalars().all())
+    pending_videos = videos_result.all()
     
     if not pending_videos:
         return {
@@ -69,11 +88,30 @@ async def process_course_content(
             "failed": 0,
         }
     
+    # Fetch all transcripts concurrently up front
+    transcripts = await ai_service.fetch_transcripts_batch(
+        [video.youtube_video_id for video in pending_videos]
+    )
+    
+    # Analyze all videos concurrently (transcript + AI, or Gemini fallback)
+    analyses = await ai_service.analyze_videos_batch([
+        {
+            "video_id": video.youtube_video_id,
+            "video_title": video.title,
+            "duration_seconds": video.duration_seconds,
+            "transcript": transcripts.get(video.youtube_video_id),
+            "fetch_missing_transcript": False,
+        }
+        for video in pending_videos
+    ])
+    
     processed_count = 0
     failed_count = 0
     results = []
+    # Row updates, written in one executemany after the loop
+    updates: List[Dict[str, Any]] = []
     
-    for video in pending_videos:
+    for video, analysis in zip(pending_videos, analyses):
         video_result = {
             "video_id": video.id,
             "youtube_id": video.youtube_video_id,
@@ -84,19 +122,17 @@ async def process_course_content(
         }
         
         try:
-            # Analyze video content (transcript + AI, or Gemini fallback)
-            analysis = await ai_service.analyze_video_content(
-                video_id=video.youtube_video_id,
-                video_title=video.title,
-                duration_seconds=video.duration_seconds,
-            )
+            if isinstance(analysis, Exception):
+                raise analysis
             
             video_result["method"] = analysis.get("method")
             
             if analysis["success"]:
                 # Check if we got valid quiz data (not just error messages)
                 quiz_data = analysis.get("quiz_data")
-                has_valid_quiz = (
+                # bool(): has_quiz is NOT NULL, and a missing quiz_data
+                # would otherwise short-circuit to None
+                has_valid_quiz = bool(
                     quiz_data 
                     and quiz_data.get("has_quiz") 
                     and len(quiz_data.get("questions", [])) > 0
@@ -104,47 +140,50 @@ async def process_course_content(
                 
                 # Only save if we have transcript OR valid quiz
                 if analysis.get("transcript") or has_valid_quiz:
-                    video.transcript_text = analysis.get("transcript")
-                    video.has_quiz = has_valid_quiz
-                    # Only save quiz_data if it has actual questions
-                    video.quiz_data = quiz_data if has_valid_quiz else None
-                    video.analysis_status = AnalysisStatus.COMPLETED
+                    updates.append({
+                        "id": video.id,
+                        "transcript_text": analysis.get("transcript"),
+                        "has_quiz": has_valid_quiz,
+                        # Only save quiz_data if it has actual questions
+                        "quiz_data": quiz_data if has_valid_quiz else None,
+                        "analysis_status": AnalysisStatus.COMPLETED,
+                    })
                     
                     processed_count += 1
                     video_result["status"] = "completed"
                     video_result["has_quiz"] = has_valid_quiz
                 else:
                     # No transcript and no valid quiz = failed
-                    video.analysis_status = AnalysisStatus.FAILED
-                    video.quiz_data = None  # Keep null, don't save error data
+                    # (keep quiz_data null, don't save error data)
+                    updates.append(_failed_update(video.id))
                     failed_count += 1
                     video_result["status"] = "failed"
                     video_result["error"] = "No transcript or quiz data available"
             else:
                 # Mark as failed - don't save any error data to quiz_data
-                video.analysis_status = AnalysisStatus.FAILED
-                video.quiz_data = None  # Explicitly keep null
+                updates.append(_failed_update(video.id))
                 failed_count += 1
                 video_result["status"] = "failed"
                 video_result["error"] = analysis.get("error", "Unknown error")
                 
         except Exception as e:
             # Handle unexpected errors - don't save error to quiz_data
-            video.analysis_status = AnalysisStatus.FAILED
-            video.quiz_data = None
+            updates.append(_failed_update(video.id))
             failed_count += 1
             video_result["status"] = "failed"
             video_result["error"] = str(e)
         
         results.append(video_result)
     
-    # Commit all changes
+    # Bulk UPDATE by primary key, then commit all changes
+    await db.execute(update(Video), updates)
     await db.commit()
+    bump_playlist_version(playlist_id)
     
     return {
         "success": True,
         "playlist_id": playlist_id,
-        "playlist_title": playlist.title,
+        "playlist_title": playlist_title,
         "total_pending": len(pending_videos),
         "processed": processed_count,
         "failed": failed_count,
@@ -166,27 +205,42 @@ async def get_analysis_status(
     Returns:
         Dict with counts by status.
     """
-    videos_result = await db.execute(
-        select(Video).where(Video.playlist_id == playlist_id)
+    # Key taken before the query: a write that commits meanwhile bumps
+    # the version, so this result is filed under the old one
+    cache_key = course_stats_key("analysis_status", playlist_id)
+    cached = get_cached_course_stats(cache_key)
+    if cached is not None:
+        return cached
+    
+    # Aggregate in Postgres: one row per status instead of one per video
+    counts_result = await db.execute(
+        select(
+            Video.analysis_status,
+            func.count().label("n"),
+            func.count().filter(Video.has_quiz.is_(True)).label("with_quiz"),
+        )
+        .where(Video.playlist_id == playlist_id)
+        .group_by(Video.analysis_status)
     )
-    videos = list(videos_result.scalars().all())
     
     status_counts = {
         "pending": 0,
         "completed": 0,
         "failed": 0,
-        "total": len(videos),
+        "total": 0,
         "with_quiz": 0,
     }
     
-    for video in videos:
-        if video.analysis_status == AnalysisStatus.PENDING:
-            status_counts["pending"] += 1
-        elif video.analysis_status == AnalysisStatus.COMPLETED:
-            status_counts["completed"] += 1
-            if video.has_quiz:
-                status_counts["with_quiz"] += 1
-        elif video.analysis_status == AnalysisStatus.FAILED:
-            status_counts["failed"] += 1
+    for analysis_status, n, with_quiz in counts_result.all():
+        status_counts["total"] += n
+        if analysis_status == AnalysisStatus.PENDING:
+            status_counts["pending"] = n
+        elif analysis_status == AnalysisStatus.COMPLETED:
+            status_counts["completed"] = n
+            status_counts["with_quiz"] = with_quiz
+        elif analysis_status == AnalysisStatus.FAILED:
+            status_counts["failed"] = n
+    
+    cache_course_stats(cache_key, status_counts)
     
     return status_counts
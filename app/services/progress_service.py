@@ -4,18 +4,26 @@ Progress Service
 Business logic for student progress tracking and quiz grading.
 """
 
+import uuid
 from typing import Optional, Tuple
 
 from fastapi import HTTPException, status
-from sqlalchemy import select
+from sqlalchemy import and_, case, func, literal, select, update
 from sqlalchemy.ext.asyncio import AsyncSession
 
+from app.core.cache import bump_playlist_version
 from app.models.user import User
 from app.models.video import Video
-from app.models.playlist import Playlist
 from app.models.enrollment import Enrollment
 from app.models.video_progress import VideoProgress
 from app.models.enums import WatchStatus
+from app.services.watch_time_buffer import (
+    ProgressSnapshot,
+    cache_progress_snapshot,
+    get_progress_snapshot,
+    invalidate_progress_snapshot,
+    record_watch_time,
+)
 
 
 async def get_video_with_playlist(
@@ -28,10 +36,10 @@ async def get_video_with_playlist(
     Args:
         video_id: Video ID.
         db: Database session.
-        
+    
     Returns:
         Video object.
-        
+    
     Raises:
         HTTPException: 404 if video not found.
     """
@@ -59,7 +67,7 @@ async def get_user_enrollments(
     Args:
         user: Current user.
         db: Database session.
-        
+    
     Returns:
         List of Enrollment objects with playlist relationship loaded.
     """
@@ -84,11 +92,14 @@ async def get_or_create_enrollment(
     """
     Get existing enrollment or create a new one.
     
+    Only flushes; the caller commits and then bumps the playlist's
+    analytics version.
+    
     Args:
         user: Current user.
         playlist_id: Playlist ID to enroll in.
         db: Database session.
-        
+    
     Returns:
         Enrollment object.
     """
@@ -127,7 +138,7 @@ async def get_or_create_progress(
         enrollment: User's enrollment.
         video_id: Video ID.
         db: Database session.
-        
+    
     Returns:
         VideoProgress object.
     """
@@ -154,6 +165,67 @@ async def get_or_create_progress(
     return progress
 
 
+def _promote_not_started():
+    """SQL expression moving NOT_STARTED to IN_PROGRESS, keeping other statuses."""
+    return case(
+        (
+            VideoProgress.watch_status == WatchStatus.NOT_STARTED,
+            literal(WatchStatus.IN_PROGRESS, VideoProgress.__table__.c.watch_status.type),
+        ),
+        else_=VideoProgress.watch_status,
+    )
+
+
+def _user_progress_update(user_id: uuid.UUID, video_id: int):
+    """
+    Build an UPDATE ... RETURNING for a user's progress row on a video.
+    
+    The enrollment join (UPDATE ... FROM enrollments) scopes the row to
+    the user, so lookup, mutation and read-back take one round trip.
+    """
+    return (
+        update(VideoProgress)
+        .where(
+            VideoProgress.video_id == video_id,
+            VideoProgress.enrollment_id == Enrollment.id,
+            Enrollment.user_id == user_id,
+        )
+        .returning(VideoProgress)
+    )
+
+
+async def _raise_progress_not_found(
+    user: User,
+    video_id: int,
+    db: AsyncSession,
+    not_enrolled_detail: str,
+) -> None:
+    """
+    Raise the 404 explaining why a user's progress row was not found.
+    
+    Only runs on the failure path, after a single-statement lookup missed.
+    
+    Raises:
+        HTTPException: 404 for a missing video, enrollment or progress.
+    """
+    video = await get_video_with_playlist(video_id, db)
+    enrollment_result = await db.execute(
+        select(Enrollment.id).where(
+            Enrollment.user_id == user.id,
+            Enrollment.playlist_id == video.playlist_id,
+        )
+    )
+    if enrollment_result.scalar_one_or_none() is None:
+        raise HTTPException(
+            status_code=status.HTTP_404_NOT_FOUND,
+            detail=not_enrolled_detail,
+        )
+    raise HTTPException(
+        status_code=status.HTTP_404_NOT_FOUND,
+        detail="Progress not found. Call /start first.",
+    )
+
+
 async def start_video(
     user: User,
     video_id: int,
@@ -168,10 +240,22 @@ async def start_video(
         user: Current user.
         video_id: Video ID to start.
         db: Database session.
-        
+    
     Returns:
         VideoProgress object.
     """
+    # Fast path: progress already exists, so promote it in one statement
+    result = await db.execute(
+        _user_progress_update(user.id, video_id)
+        .values(watch_status=_promote_not_started())
+    )
+    progress = result.scalar_one_or_none()
+    
+    if progress:
+        await db.commit()
+        invalidate_progress_snapshot(user.id, video_id)
+        return progress
+    
     # Get video and verify it exists
     video = await get_video_with_playlist(video_id, db)
     
@@ -186,6 +270,10 @@ async def start_video(
         progress.watch_status = WatchStatus.IN_PROGRESS
     
     await db.commit()
+    # After the commit, so analytics can't cache pre-commit data under
+    # the new version
+    bump_playlist_version(video.playlist_id)
+    invalidate_progress_snapshot(user.id, video_id)
     await db.refresh(progress)
     
     return progress
@@ -196,68 +284,103 @@ async def update_watch_time(
     video_id: int,
     seconds_watched: int,
     db: AsyncSession,
-) -> VideoProgress:
+) -> ProgressSnapshot:
     """
     Update the watch time for a video (heartbeat).
     
-    Called every 30 seconds by the Chrome Extension.
+    Called every 30 seconds by the Chrome Extension. The first heartbeat
+    for a video writes through to the database and caches a snapshot of
+    the progress row; later heartbeats only update the snapshot and are
+    flushed to the database in batches by the watch time buffer.
     
     Args:
         user: Current user.
         video_id: Video ID being watched.
         seconds_watched: Total seconds watched.
         db: Database session.
-        
+    
     Returns:
-        Updated VideoProgress object.
-        
+        Snapshot of the updated progress.
+    
     Raises:
         HTTPException: 404 if progress not found.
     """
-    # Get video to get playlist_id
-    video = await get_video_with_playlist(video_id, db)
+    snapshot = get_progress_snapshot(user.id, video_id)
+    if snapshot is not None:
+        return record_watch_time(snapshot, seconds_watched)
     
-    # Find the user's enrollment
-    enrollment_result = await db.execute(
-        select(Enrollment).where(
-            Enrollment.user_id == user.id,
-            Enrollment.playlist_id == video.playlist_id,
+    # Update seconds watched and ensure status is at least IN_PROGRESS
+    result = await db.execute(
+        _user_progress_update(user.id, video_id)
+        .values(
+            seconds_watched=seconds_watched,
+            watch_status=_promote_not_started(),
         )
     )
-    enrollment = enrollment_result.scalar_one_or_none()
+    progress = result.scalar_one_or_none()
     
-    if not enrollment:
-        raise HTTPException(
-            status_code=status.HTTP_404_NOT_FOUND,
-            detail="Not enrolled in this course. Call /start first.",
+    if not progress:
+        await _raise_progress_not_found(
+            user, video_id, db, "Not enrolled in this course. Call /start first."
         )
     
-    # Find progress record
-    progress_result = await db.execute(
-        select(VideoProgress).where(
-            VideoProgress.enrollment_id == enrollment.id,
-            VideoProgress.video_id == video_id,
-        )
-    )
-    progress = progress_result.scalar_one_or_none()
+    await db.commit()
     
-    if not progress:
-        raise HTTPException(
-            status_code=status.HTTP_404_NOT_FOUND,
-            detail="Progress not found. Call /start first.",
-        )
+    return cache_progress_snapshot(user.id, progress)
+
+
+def _quiz_score_delta(old_score: Optional[int], new_score: int) -> Tuple[int, int]:
+    """
+    Compute the change to an enrollment's quiz score counters.
     
-    # Update seconds watched
-    progress.seconds_watched = seconds_watched
+    Args:
+        old_score: Previously recorded score (None if never scored).
+        new_score: Score being recorded now.
     
-    # Ensure status is at least IN_PROGRESS
-    if progress.watch_status == WatchStatus.NOT_STARTED:
-        progress.watch_status = WatchStatus.IN_PROGRESS
+    Returns:
+        Tuple of (sum_delta, count_delta).
+    """
+    if old_score is None:
+        return new_score, 1
+    return new_score - old_score, 0
+
+
+async def update_enrollment_counters(
+    enrollment_id: int,
+    db: AsyncSession,
+    watched_delta: int = 0,
+    score_sum_delta: int = 0,
+    score_count_delta: int = 0,
+) -> None:
+    """
+    Incrementally update the denormalized progress counters on an enrollment.
     
-    await db.commit()
-    await db.refresh(progress)
+    Issues a single atomic UPDATE in the caller's transaction so analytics
+    can read completion and average score without scanning VideoProgress.
     
-    return progress
+    Args:
+        enrollment_id: Enrollment ID.
+        db: Database session.
+        watched_delta: Change in number of WATCHED videos.
+        score_sum_delta: Change in the sum of quiz scores.
+        score_count_delta: Change in the number of recorded quiz scores.
+    """
+    values = {}
+    if watched_delta:
+        values["watched_count"] = Enrollment.watched_count + watched_delta
+    if score_sum_delta:
+        values["quiz_score_sum"] = Enrollment.quiz_score_sum + score_sum_delta
+    if score_count_delta:
+        values["quiz_score_count"] = Enrollment.quiz_score_count + score_count_delta
+    
+    if not values:
+        return
+    
+    await db.execute(
+        update(Enrollment)
+        .where(Enrollment.id == enrollment_id)
+        .values(**values)
+    )
 
 
 async def complete_video(
@@ -275,53 +398,54 @@ async def complete_video(
         user: Current user.
         video_id: Video ID to complete.
         db: Database session.
-        
+    
     Returns:
         Updated VideoProgress object.
     """
-    # Get video to check if it has a quiz
-    video = await get_video_with_playlist(video_id, db)
-    
-    # Find enrollment
-    enrollment_result = await db.execute(
-        select(Enrollment).where(
+    # Load progress with its enrollment and video fields in one query. The
+    # row lock keeps concurrent completions from double-counting.
+    result = await db.execute(
+        select(VideoProgress, Video.playlist_id, Video.has_quiz)
+        .join(Enrollment, VideoProgress.enrollment_id == Enrollment.id)
+        .join(Video, VideoProgress.video_id == Video.id)
+        .where(
+            VideoProgress.video_id == video_id,
             Enrollment.user_id == user.id,
-            Enrollment.playlist_id == video.playlist_id,
         )
+        .with_for_update(of=VideoProgress)
     )
-    enrollment = enrollment_result.scalar_one_or_none()
+    row = result.one_or_none()
     
-    if not enrollment:
-        raise HTTPException(
-            status_code=status.HTTP_404_NOT_FOUND,
-            detail="Not enrolled in this course",
+    if not row:
+        await _raise_progress_not_found(
+            user, video_id, db, "Not enrolled in this course"
         )
     
-    # Find progress
-    progress_result = await db.execute(
-        select(VideoProgress).where(
-            VideoProgress.enrollment_id == enrollment.id,
-            VideoProgress.video_id == video_id,
-        )
-    )
-    progress = progress_result.scalar_one_or_none()
+    progress, playlist_id, has_quiz = row
     
-    if not progress:
-        raise HTTPException(
-            status_code=status.HTTP_404_NOT_FOUND,
-            detail="Progress not found. Call /start first.",
-        )
+    watched_delta = 0 if progress.watch_status == WatchStatus.WATCHED else 1
+    score_sum_delta = score_count_delta = 0
     
     # Mark as WATCHED
     progress.watch_status = WatchStatus.WATCHED
     
     # Auto-pass if video has no quiz
-    if not video.has_quiz:
+    if not has_quiz:
+        score_sum_delta, score_count_delta = _quiz_score_delta(progress.quiz_score, 100)
         progress.is_quiz_passed = True
         progress.quiz_score = 100  # Auto-passed
     
+    await update_enrollment_counters(
+        progress.enrollment_id,
+        db,
+        watched_delta=watched_delta,
+        score_sum_delta=score_sum_delta,
+        score_count_delta=score_count_delta,
+    )
+    
     await db.commit()
-    await db.refresh(progress)
+    bump_playlist_version(playlist_id)
+    invalidate_progress_snapshot(user.id, video_id)
     
     return progress
 
@@ -340,10 +464,10 @@ async def submit_quiz(
         video_id: Video ID for the quiz.
         answers: Dict mapping question index to selected answer.
         db: Database session.
-        
+    
     Returns:
         Tuple of (VideoProgress, result_dict).
-        
+    
     Raises:
         HTTPException: 400 if video has no quiz.
     """
@@ -371,11 +495,15 @@ async def submit_quiz(
             detail="Not enrolled in this course",
         )
     
+    # Lock the row so concurrent submissions read each other's quiz_score
+    # (otherwise both see None and the score counters are double-counted)
     progress_result = await db.execute(
-        select(VideoProgress).where(
+        select(VideoProgress)
+        .where(
             VideoProgress.enrollment_id == enrollment.id,
             VideoProgress.video_id == video_id,
         )
+        .with_for_update()
     )
     progress = progress_result.scalar_one_or_none()
     
@@ -399,28 +527,41 @@ async def submit_quiz(
             detail="Quiz has no questions",
         )
     
-    correct_count = 0
-    for idx, question in enumerate(questions):
-        user_answer = answers.get(str(idx), "")
-        correct_answer = question.get("answer", "")
-        
-        # Case-insensitive comparison, strip whitespace
-        if user_answer.strip().lower() == correct_answer.strip().lower():
-            correct_count += 1
-    
-    # Calculate score percentage
-    score = int((correct_count / total_questions) * 100)
+    # Case-insensitive comparison, strip whitespace. Normalize both sides
+    # once, then count matches in a single pass.
+    correct_answers = [q.get("answer", "").strip().lower() for q in questions]
+    submitted_answers = [
+        answers.get(str(idx), "").strip().lower() for idx in range(total_questions)
+    ]
+    correct_count = sum(
+        submitted == correct
+        for submitted, correct in zip(submitted_answers, correct_answers)
+    )
+    
+    # Calculate score percentage (integer math avoids float truncation,
+    # e.g. 29/100 * 100 == 28.999...)
+    score = correct_count * 100 // total_questions
     passed = score >= 75  # Pass threshold
     
     # Update progress
+    score_sum_delta, score_count_delta = _quiz_score_delta(progress.quiz_score, score)
     progress.quiz_score = score
     progress.is_quiz_passed = passed
     
+    await update_enrollment_counters(
+        enrollment.id,
+        db,
+        score_sum_delta=score_sum_delta,
+        score_count_delta=score_count_delta,
+    )
+    
     # If quiz passed, check if all quizzes in the playlist are now passed
     if passed:
         await check_and_update_enrollment_completion(enrollment, video.playlist_id, db)
     
     await db.commit()
+    bump_playlist_version(video.playlist_id)
+    invalidate_progress_snapshot(user.id, video_id)
     await db.refresh(progress)
     
     result = {
@@ -447,42 +588,41 @@ async def check_and_update_enrollment_completion(
         enrollment: User's enrollment.
         playlist_id: Playlist ID.
         db: Database session.
-        
+    
     Returns:
         True if enrollment is now complete, False otherwise.
     """
-    from sqlalchemy.orm import selectinload
+    # The caller's pending quiz result must be visible to the count below
+    # (sessions are created with autoflush=False)
+    await db.flush()
     
-    # Get all videos with quizzes in the playlist
-    playlist_result = await db.execute(
-        select(Playlist)
-        .options(selectinload(Playlist.videos))
-        .where(Playlist.id == playlist_id)
+    # Count quiz videos and how many of them this enrollment has passed,
+    # projecting only keys (no transcript_text / quiz_data hydration)
+    result = await db.execute(
+        select(
+            func.count(Video.id),
+            func.count(VideoProgress.id),
+        )
+        .select_from(Video)
+        .outerjoin(
+            VideoProgress,
+            and_(
+                VideoProgress.video_id == Video.id,
+                VideoProgress.enrollment_id == enrollment.id,
+                VideoProgress.is_quiz_passed.is_(True),
+            ),
+        )
+        .where(
+            Video.playlist_id == playlist_id,
+            Video.has_quiz.is_(True),
+        )
     )
-    playlist = playlist_result.scalar_one_or_none()
-    
-    if not playlist:
-        return False
-    
-    videos_with_quizzes = [v for v in playlist.videos if v.has_quiz]
+    total_quizzes, passed_quizzes = result.one()
     
-    if not videos_with_quizzes:
+    if not total_quizzes:
         return False
     
-    # Get all progress records for this enrollment
-    progress_result = await db.execute(
-        select(VideoProgress).where(VideoProgress.enrollment_id == enrollment.id)
-    )
-    progress_records = progress_result.scalars().all()
-    progress_map = {p.video_id: p for p in progress_records}
-    
-    # Check if all quizzes are passed
-    all_passed = True
-    for video in videos_with_quizzes:
-        vp = progress_map.get(video.id)
-        if not vp or not vp.is_quiz_passed:
-            all_passed = False
-            break
+    all_passed = passed_quizzes == total_quizzes
     
     # Update enrollment if all quizzes passed
     if all_passed and not enrollment.is_completed:
@@ -4,13 +4,22 @@ Storage Service
 Handles file uploads to Cloudinary for certificate storage.
 """
 
-from io import BytesIO
-from typing import Optional
-
-import cloudinary
-import cloudinary.uploader
+import time
 
 from app.core.config import settings
+from app.core.http_client import post_with_retry
+
+
+# Upload API endpoint (signed uploads)
+CLOUDINARY_UPLOAD_URL = "https://api.cloudinary.com/v1_1/{cloud_name}/{resource_type}/upload"
+
+
+def _upload_url() -> str:
+    """Signed upload endpoint for raw files (PDFs) in the configured cloud."""
+    return CLOUDINARY_UPLOAD_URL.format(
+        cloud_name=settings.CLOUDINARY_CLOUD_NAME,
+        resource_type="raw",  # For PDF files
+    )
 
 
 class CloudinaryService:
@@ -20,34 +29,21 @@ class CloudinaryService:
     Configured to upload certificates to the 'credlyse/certificates' folder.
     """
     
-    _configured: bool = False
-    
     @classmethod
-    def _configure(cls) -> None:
-        """Configure Cloudinary with credentials from settings."""
-        if cls._configured:
-            return
-            
-        cloudinary.config(
-            cloud_name=settings.CLOUDINARY_CLOUD_NAME,
-            api_key=settings.CLOUDINARY_API_KEY,
-            api_secret=settings.CLOUDINARY_API_SECRET,
-            secure=True,
-        )
-        cls._configured = True
-    
-    @classmethod
-    def upload_file(
+    async def upload_file(
         cls,
-        file_bytes: BytesIO,
+        file_bytes: bytes,
         filename: str,
         folder: str = "credlyse/certificates",
     ) -> str:
         """
         Upload a file to Cloudinary.
         
+        Posts a signed multipart request through the shared async HTTP
+        client, so the upload never occupies a threadpool worker.
+        
         Args:
-            file_bytes: BytesIO stream of the file content.
+            file_bytes: File content.
             filename: Name for the uploaded file (without extension).
             folder: Cloudinary folder path. Default: 'credlyse/certificates'.
             
@@ -55,28 +51,33 @@ class CloudinaryService:
             The secure_url of the uploaded file.
             
         Raises:
-            Exception: If upload fails.
+            httpx.HTTPError: If upload fails.
         """
-        cls._configure()
+        from cloudinary.utils import api_sign_request
         
-        # Reset stream position to beginning
-        file_bytes.seek(0)
+        params = {
+            "folder": folder,
+            "invalidate": "true",
+            "overwrite": "true",
+            "public_id": filename,
+            "timestamp": str(int(time.time())),
+        }
+        params["signature"] = api_sign_request(params, settings.CLOUDINARY_API_SECRET)
+        params["api_key"] = settings.CLOUDINARY_API_KEY
         
-        result = cloudinary.uploader.upload(
-            file_bytes,
-            public_id=filename,
-            folder=folder,
-            resource_type="raw",  # For PDF files
-            overwrite=True,
-            invalidate=True,
+        response = await post_with_retry(
+            _upload_url(),
+            data=params,
+            files={"file": (filename, file_bytes, "application/pdf")},
         )
+        response.raise_for_status()
         
-        return result["secure_url"]
+        return response.json()["secure_url"]
     
     @classmethod
-    def upload_pdf(
+    async def upload_pdf(
         cls,
-        pdf_bytes: BytesIO,
+        pdf_bytes: bytes,
         certificate_id: str,
     ) -> str:
         """
@@ -85,13 +86,13 @@ class CloudinaryService:
         Convenience wrapper for certificate uploads.
         
         Args:
-            pdf_bytes: BytesIO stream of the PDF content.
+            pdf_bytes: PDF content.
             certificate_id: Unique certificate ID to use as filename.
             
         Returns:
             The secure_url of the uploaded PDF.
         """
-        return cls.upload_file(
+        return await cls.upload_file(
             file_bytes=pdf_bytes,
             filename=f"certificate_{certificate_id}",
             folder="credlyse/certificates",
@@ -0,0 +1,210 @@
+"""
+Watch Time Buffer
+
+Coalesces heartbeat writes in-process. Heartbeats update a pending value
+per progress row and a background task flushes all pending values to
+Postgres in one batched UPDATE every FLUSH_INTERVAL_SECONDS.
+
+seconds_watched is a running total reported by the client, so only the
+latest value per row is kept. The flush never lowers a stored value
+(GREATEST), so a batch drained before a write-through can't undo it.
+Values buffered since the last flush are lost if the process is killed
+without a clean shutdown.
+
+Assumes a single app process: snapshots and their invalidation are
+per-process, so with several uvicorn workers a worker that didn't handle
+a start/complete/quiz request keeps serving the old watch_status and
+is_quiz_passed until its snapshot expires (SNAPSHOT_TTL_SECONDS).
+"""
+
+import asyncio
+import logging
+import uuid
+from dataclasses import dataclass
+from typing import Dict, Optional
+
+from sqlalchemy import bindparam, func, update
+
+from app.core.cache import TTLCache
+from app.core.database import get_session_maker
+from app.models.enums import WatchStatus
+from app.models.video_progress import VideoProgress
+
+
+logger = logging.getLogger(__name__)
+
+
+FLUSH_INTERVAL_SECONDS = 30
+SNAPSHOT_TTL_SECONDS = 300  # 5 minutes
+
+
+@dataclass(slots=True)
+class ProgressSnapshot:
+    """Cached view of a VideoProgress row used to answer heartbeats."""
+    id: int
+    video_id: int
+    watch_status: WatchStatus
+    seconds_watched: int
+    is_quiz_passed: bool
+    quiz_score: Optional[int]
+
+
+# ============== Buffer State ==============
+
+# Progress snapshots keyed by "user_id:video_id". Entries
+# are invalidated whenever start/complete/quiz changes the row.
+_snapshot_cache: TTLCache[ProgressSnapshot] = TTLCache(
+    max_size=10000,
+    default_ttl=SNAPSHOT_TTL_SECONDS,
+)
+
+# Latest unflushed seconds_watched per VideoProgress ID
+_pending: Dict[int, int] = {}
+
+_flush_task: Optional[asyncio.Task] = None
+
+
+def _snapshot_key(user_id: uuid.UUID, video_id: int) -> str:
+    return f"{user_id}:{video_id}"
+
+
+# ============== Snapshot Helpers ==============
+
+def get_progress_snapshot(user_id: uuid.UUID, video_id: int) -> Optional[ProgressSnapshot]:
+    """Get the cached progress snapshot for a user's video, if any."""
+    return _snapshot_cache.get(_snapshot_key(user_id, video_id))
+
+
+def cache_progress_snapshot(user_id: uuid.UUID, progress: VideoProgress) -> ProgressSnapshot:
+    """
+    Cache a snapshot of a progress row for subsequent heartbeats.
+    
+    Args:
+        user_id: Owner of the enrollment.
+        progress: Freshly loaded VideoProgress.
+    
+    Returns:
+        The cached snapshot.
+    """
+    snapshot = ProgressSnapshot(
+        id=progress.id,
+        video_id=progress.video_id,
+        watch_status=progress.watch_status,
+        seconds_watched=progress.seconds_watched,
+        is_quiz_passed=progress.is_quiz_passed,
+        quiz_score=progress.quiz_score,
+    )
+    _snapshot_cache.set(_snapshot_key(user_id, progress.video_id), snapshot)
+    # The row was just written through, so any buffered value is older
+    _pending.pop(progress.id, None)
+    return snapshot
+
+
+def invalidate_progress_snapshot(user_id: uuid.UUID, video_id: int) -> None:
+    """Drop a cached snapshot after its row was changed outside heartbeats."""
+    _snapshot_cache.delete(_snapshot_key(user_id, video_id))
+
+
+def record_watch_time(snapshot: ProgressSnapshot, seconds_watched: int) -> ProgressSnapshot:
+    """
+    Buffer a heartbeat's watch time for the next flush.
+    
+    Args:
+        snapshot: Cached snapshot of the progress row.
+        seconds_watched: Total seconds watched reported by the client.
+    
+    Returns:
+        The snapshot, updated with the new value.
+    """
+    snapshot.seconds_watched = seconds_watched
+    _pending[snapshot.id] = seconds_watched
+    return snapshot
+
+
+# ============== Flushing ==============
+
+async def flush_watch_time() -> int:
+    """
+    Write all buffered watch times to the database in one batch.
+    
+    On failure, the drained values are put back unless a newer heartbeat
+    already replaced them.
+    
+    Returns:
+        Number of progress rows updated.
+    """
+    if not _pending:
+        return 0
+    
+    batch = dict(_pending)
+    _pending.clear()
+    
+    try:
+        session_maker = get_session_maker()
+        async with session_maker() as session:
+            # Single executemany UPDATE for the whole batch. GREATEST keeps
+            # a stale batch from lowering a value written since it was drained.
+            table = VideoProgress.__table__
+            await session.execute(
+                update(table)
+                .where(table.c.id == bindparam("progress_id"))
+                .values(
+                    seconds_watched=func.greatest(
+                        table.c.seconds_watched, bindparam("seconds")
+                    )
+                ),
+                [
+                    {"progress_id": progress_id, "seconds": seconds}
+                    for progress_id, seconds in batch.items()
+                ],
+            )
+            await session.commit()
+    except Exception:
+        for progress_id, seconds in batch.items():
+            _pending.setdefault(progress_id, seconds)
+        raise
+    
+    return len(batch)
+
+
+async def _flush_loop(interval: float) -> None:
+    """Flush buffered watch times every `interval` seconds until cancelled."""
+    while True:
+        await asyncio.sleep(interval)
+        try:
+            await flush_watch_time()
+        except Exception:
+            logger.exception("Failed to flush %d buffered watch times", len(_pending))
+
+
+def start_watch_time_flusher(interval: float = FLUSH_INTERVAL_SECONDS) -> None:
+    """
+    Start the background flush task.
+    
+    Should be called during application startup.
+    """
+    global _flush_task
+    if _flush_task is None:
+        _flush_task = asyncio.create_task(_flush_loop(interval))
+
+
+async def stop_watch_time_flusher() -> None:
+    """
+    Stop the background flush task and flush whatever is still buffered.
+    
+    Should be called during application shutdown, before the engine is
+    disposed.
+    """
+    global _flush_task
+    if _flush_task is not None:
+        _flush_task.cancel()
+        try:
+            await _flush_task
+        except asyncio.CancelledError:
+            pass
+        _flush_task = None
+    
+    try:
+        await flush_watch_time()
+    except Exception:
+        logger.exception("Failed to flush %d buffered watch times on shutdown", len(_pending))
@@ -12,6 +12,25 @@ import pytest
 from sqlalchemy.ext.asyncio import AsyncSession
 
 
+# ==================== Cache Fixtures ====================
+
+@pytest.fixture(autouse=True)
+def clear_ai_caches() -> Generator[None, None, None]:
+    """
+    Clear the transcript and quiz caches around every test.
+    
+    AI service calls are cached in-process, so results from one test
+    would otherwise leak into the next.
+    """
+    from app.core.cache import quiz_cache, transcript_cache
+    
+    transcript_cache.clear()
+    quiz_cache.clear()
+    yield
+    transcript_cache.clear()
+    quiz_cache.clear()
+
+
 # ==================== Database Fixtures ====================
 
 @pytest.fixture
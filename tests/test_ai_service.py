@@ -25,7 +25,7 @@ class TestFetchTranscript:
         This is the CRITICAL fix for scalability - synchronous YouTube API calls
         must be offloaded to a thread pool.
         """
-        with patch("app.services.ai_service.asyncio.get_event_loop") as mock_get_loop:
+        with patch("app.services.ai_service.asyncio.get_running_loop") as mock_get_loop:
             mock_loop = MagicMock()
             mock_loop.run_in_executor = AsyncMock(return_value=sample_transcript)
             mock_get_loop.return_value = mock_loop
@@ -42,7 +42,7 @@ class TestFetchTranscript:
     @pytest.mark.asyncio
     async def test_fetch_transcript_async_handles_unavailable(self):
         """Verify graceful handling when transcript is not available."""
-        with patch("app.services.ai_service.asyncio.get_event_loop") as mock_get_loop:
+        with patch("app.services.ai_service.asyncio.get_running_loop") as mock_get_loop:
             mock_loop = MagicMock()
             mock_loop.run_in_executor = AsyncMock(return_value=None)
             mock_get_loop.return_value = mock_loop
@@ -53,10 +53,25 @@ class TestFetchTranscript:
             
             assert result is None
 
+    @pytest.mark.asyncio
+    async def test_fetch_transcript_async_caches_unavailable(self):
+        """Verify a missing transcript is remembered instead of re-fetched."""
+        with patch("app.services.ai_service.asyncio.get_running_loop") as mock_get_loop:
+            mock_loop = MagicMock()
+            mock_loop.run_in_executor = AsyncMock(return_value=None)
+            mock_get_loop.return_value = mock_loop
+            
+            from app.services.ai_service import fetch_transcript_async
+            
+            assert await fetch_transcript_async("no_captions") is None
+            assert await fetch_transcript_async("no_captions") is None
+            
+            mock_loop.run_in_executor.assert_called_once()
+
     @pytest.mark.asyncio
     async def test_fetch_transcript_async_handles_exception(self):
         """Verify graceful handling when YouTube API throws an exception."""
-        with patch("app.services.ai_service.asyncio.get_event_loop") as mock_get_loop:
+        with patch("app.services.ai_service.asyncio.get_running_loop") as mock_get_loop:
             mock_loop = MagicMock()
             mock_loop.run_in_executor = AsyncMock(side_effect=Exception("API Error"))
             mock_get_loop.return_value = mock_loop
@@ -68,6 +83,107 @@ class TestFetchTranscript:
             
             assert result is None
 
+    @pytest.mark.asyncio
+    async def test_fetch_transcript_async_does_not_cache_transient_errors(self, sample_transcript):
+        """Verify a network error is retried instead of cached as 'no transcript'."""
+        with patch("app.services.ai_service.asyncio.get_running_loop") as mock_get_loop:
+            mock_loop = MagicMock()
+            mock_loop.run_in_executor = AsyncMock(
+                side_effect=[TimeoutError("read timed out"), sample_transcript]
+            )
+            mock_get_loop.return_value = mock_loop
+            
+            from app.services.ai_service import fetch_transcript_async
+            
+            assert await fetch_transcript_async("flaky_video") is None
+            assert await fetch_transcript_async("flaky_video") == sample_transcript
+
+    def test_fetch_transcript_returns_none_only_without_transcripts(self):
+        """Verify disabled transcripts return None but transient errors raise."""
+        from youtube_transcript_api import TranscriptsDisabled
+        from app.services import ai_service
+        
+        api = MagicMock()
+        with patch.object(ai_service, "get_transcript_api", return_value=api):
+            api.fetch.side_effect = TranscriptsDisabled("no_captions")
+            assert ai_service.fetch_transcript("no_captions") is None
+            
+            api.fetch.side_effect = ConnectionError("network down")
+            with pytest.raises(ConnectionError):
+                ai_service.fetch_transcript("flaky_video")
+
+
+class TestFetchTranscriptsBatch:
+    """Tests for concurrent batch transcript fetching."""
+
+    @pytest.mark.asyncio
+    async def test_batch_maps_each_video_to_its_transcript(self):
+        """Verify every requested video ID appears in the result mapping."""
+        async def fake_fetch(video_id):
+            return None if video_id == "missing" else f"text for {video_id}"
+        
+        with patch("app.services.ai_service.fetch_transcript_async", side_effect=fake_fetch):
+            from app.services.ai_service import fetch_transcripts_batch
+            
+            result = await fetch_transcripts_batch(["a", "missing", "b"])
+        
+        assert result == {"a": "text for a", "missing": None, "b": "text for b"}
+
+    @pytest.mark.asyncio
+    async def test_batch_respects_concurrency_limit(self):
+        """Verify no more than TRANSCRIPT_FETCH_CONCURRENCY fetches run at once."""
+        concurrent_count = 0
+        max_concurrent = 0
+        
+        async def slow_fetch(video_id):
+            nonlocal concurrent_count, max_concurrent
+            concurrent_count += 1
+            max_concurrent = max(max_concurrent, concurrent_count)
+            await asyncio.sleep(0.01)
+            concurrent_count -= 1
+            return "text"
+        
+        with patch("app.services.ai_service.fetch_transcript_async", side_effect=slow_fetch):
+            from app.services.ai_service import (
+                fetch_transcripts_batch,
+                TRANSCRIPT_FETCH_CONCURRENCY,
+            )
+            
+            await fetch_transcripts_batch([f"video_{i}" for i in range(25)])
+        
+        assert 1 < max_concurrent <= TRANSCRIPT_FETCH_CONCURRENCY
+
+
+class TestAnalyzeVideosBatch:
+    """Tests for bounded concurrent video analysis."""
+
+    @pytest.mark.asyncio
+    async def test_batch_bounds_concurrency_and_keeps_failures_in_place(self):
+        """Verify at most ANALYSIS_CONCURRENCY analyses run and errors stay in their slot."""
+        concurrent_count = 0
+        max_concurrent = 0
+        
+        async def slow_analyze(video_id, **kwargs):
+            nonlocal concurrent_count, max_concurrent
+            concurrent_count += 1
+            max_concurrent = max(max_concurrent, concurrent_count)
+            await asyncio.sleep(0.01)
+            concurrent_count -= 1
+            if video_id == "bad":
+                raise RuntimeError("boom")
+            return {"success": True, "video_id": video_id}
+        
+        videos = [{"video_id": f"video_{i}"} for i in range(20)] + [{"video_id": "bad"}]
+        
+        with patch("app.services.ai_service.analyze_video_content", side_effect=slow_analyze):
+            from app.services.ai_service import analyze_videos_batch, ANALYSIS_CONCURRENCY
+            
+            results = await analyze_videos_batch(videos)
+        
+        assert 1 < max_concurrent <= ANALYSIS_CONCURRENCY
+        assert results[0] == {"success": True, "video_id": "video_0"}
+        assert isinstance(results[-1], RuntimeError)
+
 
 # ==================== Quiz Generation Tests ====================
 
@@ -98,8 +214,8 @@ class TestGenerateQuizWithOpenAI:
     @pytest.mark.asyncio
     async def test_generate_quiz_truncates_long_transcripts(self, sample_quiz_data):
         """Verify long transcripts are truncated to prevent token overflow."""
-        # Create a very long transcript (> 12000 chars)
-        long_transcript = "x" * 15000
+        # Create a very long transcript (over the token budget)
+        long_transcript = "x " * 15000
         
         mock_response = MagicMock()
         mock_response.choices = [MagicMock()]
@@ -135,6 +251,113 @@ class TestGenerateQuizWithOpenAI:
             
             assert "OpenAI API Error" in str(exc_info.value)
 
+    @pytest.mark.asyncio
+    async def test_generate_quiz_reuses_cached_result(self, sample_transcript, sample_quiz_data):
+        """Verify an identical transcript doesn't trigger a second OpenAI call."""
+        mock_response = MagicMock()
+        mock_response.choices = [MagicMock()]
+        mock_response.choices[0].message.content = json.dumps(sample_quiz_data)
+        
+        with patch("app.services.ai_service.get_openai_client") as mock_get_client:
+            mock_client = AsyncMock()
+            mock_client.chat.completions.create = AsyncMock(return_value=mock_response)
+            mock_get_client.return_value = mock_client
+            
+            from app.services.ai_service import generate_quiz_with_openai
+            
+            first = await generate_quiz_with_openai(sample_transcript)
+            second = await generate_quiz_with_openai(sample_transcript)
+            
+            mock_client.chat.completions.create.assert_called_once()
+            assert first == second
+
+    @pytest.mark.asyncio
+    async def test_cached_quiz_is_isolated_from_callers(self, sample_transcript, sample_quiz_data):
+        """Verify modifying a returned quiz doesn't change the cached entry."""
+        mock_response = MagicMock()
+        mock_response.choices = [MagicMock()]
+        mock_response.choices[0].message.content = json.dumps(sample_quiz_data)
+        
+        with patch("app.services.ai_service.get_openai_client") as mock_get_client:
+            mock_client = AsyncMock()
+            mock_client.chat.completions.create = AsyncMock(return_value=mock_response)
+            mock_get_client.return_value = mock_client
+            
+            from app.services.ai_service import generate_quiz_with_openai
+            
+            first = await generate_quiz_with_openai(sample_transcript)
+            first["questions"].clear()
+            second = await generate_quiz_with_openai(sample_transcript)
+            second["questions"][0]["q"] = "changed"
+            third = await generate_quiz_with_openai(sample_transcript)
+            
+            assert third["questions"] == sample_quiz_data["questions"]
+
+
+# ==================== Transcript Truncation Tests ====================
+
+class TestTruncateTranscript:
+    """Tests for token-budget transcript truncation."""
+
+    def test_truncates_by_tokens(self):
+        """Verify transcripts over the token budget are cut at a token boundary."""
+        from app.services import ai_service
+        
+        # One token per word
+        encoding = MagicMock()
+        encoding.encode.side_effect = lambda text, **kwargs: text.split()
+        encoding.decode.side_effect = lambda tokens: " ".join(tokens)
+        
+        words = [f"w{i}" for i in range(ai_service.MAX_TRANSCRIPT_TOKENS + 5)]
+        
+        with patch.object(ai_service, "get_token_encoding", return_value=encoding):
+            short = " ".join(words[:10])
+            assert ai_service.truncate_transcript(short) is short
+            
+            result = ai_service.truncate_transcript(" ".join(words))
+        
+        assert result.endswith("... [truncated]")
+        assert len(result.removesuffix("... [truncated]").split()) == ai_service.MAX_TRANSCRIPT_TOKENS
+
+    def test_falls_back_to_characters_without_tokenizer(self):
+        """Verify character truncation is used when tiktoken can't load."""
+        from app.services import ai_service
+        
+        with patch.object(ai_service, "get_token_encoding", return_value=None):
+            result = ai_service.truncate_transcript("x" * 15000)
+        
+        assert result == "x" * ai_service.MAX_TRANSCRIPT_CHARS + "... [truncated]"
+
+
+# ==================== Gemini Response Parsing Tests ====================
+
+class TestFindJsonObject:
+    """Tests for extracting JSON objects from free-form model output."""
+
+    def test_extracts_object_surrounded_by_prose(self):
+        """Verify leading/trailing text and code fences are ignored."""
+        from app.services.ai_service import _find_json_object
+        
+        text = 'Here is the quiz:\n```json\n{"has_quiz": true, "questions": []}\n```\nDone.'
+        
+        assert json.loads(_find_json_object(text)) == {"has_quiz": True, "questions": []}
+
+    def test_ignores_braces_inside_strings(self):
+        """Verify braces and escaped quotes in string values don't affect depth."""
+        from app.services.ai_service import _find_json_object
+        
+        obj = {"reason": 'uses {curly} and \\"quoted\\" text', "nested": {"a": 1}}
+        text = f"prefix {json.dumps(obj)} suffix {{not json}}"
+        
+        assert json.loads(_find_json_object(text)) == obj
+
+    def test_returns_none_without_complete_object(self):
+        """Verify None is returned when no balanced object exists."""
+        from app.services.ai_service import _find_json_object
+        
+        assert _find_json_object("no json here") is None
+        assert _find_json_object('{"unterminated": [1, 2') is None
+
 
 # ==================== Analyze Video Content Tests ====================
 
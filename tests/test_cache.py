@@ -148,3 +148,75 @@ class TestCacheHelpers:
         
         # Should be retrievable
         assert get_cached_quiz("test_video") == quiz_data
+
+
+class TestCourseStatsCache:
+    """Tests for versioned course read-path caching."""
+
+    def test_cached_value_returned_for_same_version(self):
+        """Verify cached stats are returned until the version changes."""
+        from app.core.cache import (
+            cache_course_stats,
+            course_stats_key,
+            get_cached_course_stats,
+            course_stats_cache,
+        )
+        
+        course_stats_cache.clear()
+        key = course_stats_key("analytics", 42)
+        
+        assert get_cached_course_stats(key) is None
+        
+        cache_course_stats(key, {"total": 3})
+        
+        assert get_cached_course_stats(course_stats_key("analytics", 42)) == {"total": 3}
+
+    def test_bump_version_invalidates_cached_value(self):
+        """Verify bumping the playlist version makes old entries unreachable."""
+        from app.core.cache import (
+            bump_playlist_version,
+            cache_course_stats,
+            course_stats_key,
+            get_cached_course_stats,
+            course_stats_cache,
+        )
+        
+        course_stats_cache.clear()
+        
+        old_key = course_stats_key("analysis_status", 7)
+        cache_course_stats(old_key, {"pending": 1})
+        
+        bump_playlist_version(7)
+        
+        assert course_stats_key("analysis_status", 7) != old_key
+        assert get_cached_course_stats(course_stats_key("analysis_status", 7)) is None
+
+
+class TestCourseMetadataCache:
+    """Tests for the per-process course metadata cache."""
+
+    @pytest.mark.asyncio
+    async def test_metadata_queried_once_until_invalidated(self):
+        """Verify repeat lookups skip the DB and invalidation forces a reload."""
+        from unittest.mock import AsyncMock, MagicMock
+        from app.core.cache import course_metadata_cache, invalidate_course_metadata
+        from app.services.course_service import get_course_metadata_cached
+        
+        course_metadata_cache.clear()
+        
+        result = MagicMock()
+        result.one_or_none.return_value = (5, 9, False)
+        db = AsyncMock()
+        db.execute.return_value = result
+        
+        first = await get_course_metadata_cached(5, db)
+        second = await get_course_metadata_cached(5, db)
+        
+        assert first is second
+        assert first.creator_id == 9
+        assert db.execute.await_count == 1
+        
+        invalidate_course_metadata(5)
+        await get_course_metadata_cached(5, db)
+        
+        assert db.execute.await_count == 2
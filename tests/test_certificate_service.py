@@ -0,0 +1,52 @@
+"""
+Certificate Service Unit Tests
+
+Tests for certificate eligibility and issuing.
+"""
+
+import uuid
+from unittest.mock import MagicMock
+
+import pytest
+
+
+class TestIssueCertificate:
+    """Tests for claiming a certificate."""
+
+    @pytest.mark.asyncio
+    async def test_ineligible_claim_lists_every_missing_requirement(self, mock_async_session):
+        """Verify the 400 detail reports all missing requirements, not just the first."""
+        from fastapi import HTTPException
+        from app.models.enums import WatchStatus
+        from app.services.certificate_service import issue_certificate
+        
+        enrollment = MagicMock(id=3, playlist_id=12)
+        
+        # No existing certificate
+        mock_async_session.scalar.return_value = None
+        
+        enrollment_result = MagicMock()
+        enrollment_result.one_or_none.return_value = (enrollment, "Course")
+        eligibility_result = MagicMock()
+        eligibility_result.all.return_value = [
+            (1, "Intro", None, None, None),
+            (2, "Basics", WatchStatus.IN_PROGRESS, False, 20),
+            (3, "Done", WatchStatus.WATCHED, True, 21),
+        ]
+        mock_async_session.execute.side_effect = [enrollment_result, eligibility_result]
+        
+        user = MagicMock()
+        user.id = uuid.uuid4()
+        
+        with pytest.raises(HTTPException) as exc_info:
+            await issue_certificate(user, 12, mock_async_session)
+        
+        assert exc_info.value.status_code == 400
+        assert exc_info.value.detail == {
+            "message": "Not eligible for certificate yet",
+            "missing_requirements": [
+                "Video 'Intro' not started",
+                "Video 'Basics' not fully watched",
+                "Video 'Basics' quiz not passed",
+            ],
+        }
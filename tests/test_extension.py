@@ -0,0 +1,55 @@
+"""
+Extension Endpoint Unit Tests
+
+Tests for the Chrome extension enrollment endpoint.
+"""
+
+import uuid
+from unittest.mock import MagicMock, patch
+
+import pytest
+
+
+class TestEnrollInPlaylist:
+    """Tests for enrolling through the extension."""
+
+    @pytest.mark.asyncio
+    async def test_new_enrollment_bumps_playlist_version(self, mock_async_session):
+        """Verify a new enrollment invalidates cached course analytics."""
+        from app.api.v1.endpoints import extension
+        
+        playlist = MagicMock()
+        playlist.videos = [MagicMock(id=1)]
+        playlist_result = MagicMock()
+        playlist_result.scalar_one_or_none.return_value = playlist
+        existing_result = MagicMock()
+        existing_result.scalar_one_or_none.return_value = None
+        mock_async_session.execute.side_effect = [playlist_result, existing_result]
+        mock_async_session.add = MagicMock()
+        
+        user = MagicMock()
+        user.id = uuid.uuid4()
+        
+        with patch.object(extension, "bump_playlist_version") as mock_bump:
+            result = await extension.enroll_in_playlist(12, mock_async_session, user)
+        
+        assert result["message"] == "Enrolled successfully"
+        mock_async_session.commit.assert_awaited_once()
+        mock_bump.assert_called_once_with(12)
+
+    @pytest.mark.asyncio
+    async def test_existing_enrollment_does_not_bump(self, mock_async_session):
+        """Verify re-enrolling leaves the cached analytics alone."""
+        from app.api.v1.endpoints import extension
+        
+        playlist_result = MagicMock()
+        playlist_result.scalar_one_or_none.return_value = MagicMock()
+        existing_result = MagicMock()
+        existing_result.scalar_one_or_none.return_value = MagicMock(id=5)
+        mock_async_session.execute.side_effect = [playlist_result, existing_result]
+        
+        with patch.object(extension, "bump_playlist_version") as mock_bump:
+            result = await extension.enroll_in_playlist(12, mock_async_session, MagicMock())
+        
+        assert result == {"message": "Already enrolled", "enrollment_id": 5}
+        mock_bump.assert_not_called()
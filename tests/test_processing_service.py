@@ -1,72 +1,103 @@
 """
 Processing Service Unit Tests
 
-Tests for concurrent video processing following TDD principles.
+Tests for batched video processing following TDD principles.
 These tests verify the scalability improvements.
 """
 
-import asyncio
+from types import SimpleNamespace
 from unittest.mock import AsyncMock, MagicMock, patch
 
 import pytest
 
 
-# ==================== Concurrent Processing Tests ====================
+# ==================== Batch Processing Tests ====================
 
 class TestProcessCourseContent:
-    """Tests for course content processing with concurrency."""
+    """Tests for batched course content processing."""
 
-    @pytest.mark.asyncio
-    async def test_process_videos_concurrently_with_semaphore(self, mock_async_session):
-        """
-        Verify that videos are processed concurrently with a semaphore limit.
-        
-        This is CRITICAL for scalability - processing 50 videos should not take
-        50x the time of processing 1 video.
-        """
-        # Create mock videos
-        mock_videos = [
-            MagicMock(
+    @staticmethod
+    def _pending_rows(count: int) -> list:
+        """Column rows as returned by the pending-videos SELECT."""
+        return [
+            SimpleNamespace(
                 id=i,
                 youtube_video_id=f"video_{i}",
                 title=f"Video {i}",
-                analysis_status="PENDING"
+                duration_seconds=600,
             )
-            for i in range(10)
+            for i in range(count)
         ]
+
+    @staticmethod
+    def _setup_session(session: AsyncMock, rows: list) -> None:
+        session.scalar.return_value = "Test Playlist"
+        videos_result = MagicMock()
+        videos_result.all.return_value = rows
+        session.execute.side_effect = [videos_result, MagicMock()]
+
+    @pytest.mark.asyncio
+    async def test_process_fetches_and_analyzes_in_batches(self, mock_async_session):
+        """
+        Verify transcripts and analyses are each requested once for the
+        whole batch and the results are written in one bulk UPDATE.
+        """
+        from app.models.enums import AnalysisStatus
+        from app.services import processing_service
         
-        # Track how many videos are being processed simultaneously
-        concurrent_count = 0
-        max_concurrent = 0
-        
-        async def mock_analyze(video_id, title):
-            nonlocal concurrent_count, max_concurrent
-            concurrent_count += 1
-            max_concurrent = max(max_concurrent, concurrent_count)
-            await asyncio.sleep(0.1)  # Simulate API call
-            concurrent_count -= 1
-            return {
-                "success": True,
-                "transcript": "test",
-                "quiz_data": {"has_quiz": True, "questions": []},
-                "method": "openai"
-            }
-        
-        with patch("app.services.processing_service.ai_service") as mock_ai:
-            mock_ai.analyze_video_content = mock_analyze
-            
-            # Mock playlist query
-            mock_playlist = MagicMock(id=1, title="Test Playlist")
-            mock_async_session.execute.return_value.scalar_one_or_none.return_value = mock_playlist
-            mock_async_session.execute.return_value.scalars.return_value.all.return_value = mock_videos
-            
-            from app.services.processing_service import process_course_content
-            
-            result = await process_course_content(1, mock_async_session)
+        rows = self._pending_rows(3)
+        self._setup_session(mock_async_session, rows)
+        quiz_data = {"has_quiz": True, "questions": [{"q": "?", "answer": "a"}]}
+        
+        with patch.object(processing_service, "ai_service") as mock_ai, \
+             patch.object(processing_service, "bump_playlist_version"):
+            mock_ai.fetch_transcripts_batch = AsyncMock(
+                return_value={"video_0": "t0", "video_1": "t1", "video_2": None}
+            )
+            mock_ai.analyze_videos_batch = AsyncMock(return_value=[
+                {"success": True, "transcript": "t0", "quiz_data": quiz_data, "method": "openai"},
+                {"success": True, "transcript": "t1", "quiz_data": None, "method": "openai"},
+                {"success": True, "transcript": None, "quiz_data": quiz_data, "method": "gemini"},
+            ])
             
-            # Verify concurrent processing happened (max should be > 1)
-            assert max_concurrent > 1, f"Expected concurrent processing, but max was {max_concurrent}"
-            assert max_concurrent <= 5, f"Semaphore limit exceeded: {max_concurrent}"
+            result = await processing_service.process_course_content(1, mock_async_session)
+        
+        mock_ai.fetch_transcripts_batch.assert_awaited_once_with(
+            ["video_0", "video_1", "video_2"]
+        )
+        batch = mock_ai.analyze_videos_batch.await_args.args[0]
+        assert [v["transcript"] for v in batch] == ["t0", "t1", None]
+        assert all(v["fetch_missing_transcript"] is False for v in batch)
+        
+        assert result["processed"] == 3
+        assert result["failed"] == 0
+        
+        # Second execute is the bulk UPDATE: (statement, parameter rows)
+        update_call = mock_async_session.execute.call_args_list[1]
+        assert update_call.args[1] == [
+            {
+                "id": 0,
+                "transcript_text": "t0",
+                "has_quiz": True,
+                "quiz_data": quiz_data,
+                "analysis_status": AnalysisStatus.COMPLETED,
+            },
+            {
+                "id": 1,
+                "transcript_text": "t1",
+                "has_quiz": False,
+                "quiz_data": None,
+                "analysis_status": AnalysisStatus.COMPLETED,
+            },
+            {
+                "id": 2,
+                "transcript_text": None,
+                "has_quiz": True,
+                "quiz_data": quiz_data,
+                "analysis_status": AnalysisStatus.COMPLETED,
+            },
+        ]
+        mock_async_session.commit.assert_awaited_once()
 
     @pytest.mark.asyncio
     async def test_process_handles_partial_failures(self, mock_async_session):
@@ -75,58 +106,54 @@ class TestProcessCourseContent:
         
         Important for reliability - one bad video shouldn't stop the entire batch.
         """
-        mock_videos = [
-            MagicMock(
-                id=i,
-                youtube_video_id=f"video_{i}",
-                title=f"Video {i}",
-                analysis_status="PENDING"
-            )
-            for i in range(5)
-        ]
-        
-        call_count = 0
-        
-        async def mock_analyze(video_id, title):
-            nonlocal call_count
-            call_count += 1
-            if call_count == 3:  # Fail on 3rd video
-                raise Exception("API Error")
-            return {
-                "success": True,
-                "transcript": "test",
-                "quiz_data": {"has_quiz": True, "questions": []},
-                "method": "openai"
-            }
-        
-        with patch("app.services.processing_service.ai_service") as mock_ai:
-            mock_ai.analyze_video_content = mock_analyze
-            
-            mock_playlist = MagicMock(id=1, title="Test Playlist")
-            mock_async_session.execute.return_value.scalar_one_or_none.return_value = mock_playlist
-            mock_async_session.execute.return_value.scalars.return_value.all.return_value = mock_videos
-            
-            from app.services.processing_service import process_course_content
-            
-            result = await process_course_content(1, mock_async_session)
+        from app.models.enums import AnalysisStatus
+        from app.services import processing_service
+        
+        rows = self._pending_rows(4)
+        self._setup_session(mock_async_session, rows)
+        
+        with patch.object(processing_service, "ai_service") as mock_ai, \
+             patch.object(processing_service, "bump_playlist_version"):
+            mock_ai.fetch_transcripts_batch = AsyncMock(return_value={})
+            mock_ai.analyze_videos_batch = AsyncMock(return_value=[
+                {"success": True, "transcript": "t0", "quiz_data": None, "method": "openai"},
+                Exception("API Error"),
+                {"success": False, "error": "No transcript", "method": "gemini"},
+                {"success": True, "transcript": None, "quiz_data": None, "method": "gemini"},
+            ])
             
-            # Should have processed all 5, with 1 failure
-            assert result["processed"] + result["failed"] == 5
+            result = await processing_service.process_course_content(1, mock_async_session)
+        
+        assert result["processed"] == 1
+        assert result["failed"] == 3
+        assert result["details"][1]["error"] == "API Error"
+        
+        updates = mock_async_session.execute.call_args_list[1].args[1]
+        assert [u["analysis_status"] for u in updates] == [
+            AnalysisStatus.COMPLETED,
+            AnalysisStatus.FAILED,
+            AnalysisStatus.FAILED,
+            AnalysisStatus.FAILED,
+        ]
+        assert all(u["quiz_data"] is None for u in updates[1:])
 
     @pytest.mark.asyncio
     async def test_process_empty_playlist_returns_early(self, mock_async_session):
         """Verify early return when no pending videos exist."""
-        mock_playlist = MagicMock(id=1, title="Test Playlist")
-        mock_async_session.execute.return_value.scalar_one_or_none.return_value = mock_playlist
-        mock_async_session.execute.return_value.scalars.return_value.all.return_value = []
+        from app.services import processing_service
         
-        from app.services.processing_service import process_course_content
+        self._setup_session(mock_async_session, [])
         
-        result = await process_course_content(1, mock_async_session)
+        with patch.object(processing_service, "ai_service") as mock_ai:
+            mock_ai.fetch_transcripts_batch = AsyncMock()
+            
+            result = await processing_service.process_course_content(1, mock_async_session)
         
         assert result["success"] is True
         assert result["processed"] == 0
         assert "No pending videos" in result.get("message", "")
+        mock_ai.fetch_transcripts_batch.assert_not_awaited()
+        mock_async_session.commit.assert_not_awaited()
 
 
 # ==================== Analysis Status Tests ====================
@@ -139,15 +166,15 @@ class TestGetAnalysisStatus:
         """Verify accurate counting of video statuses."""
         from app.models.enums import AnalysisStatus
         
-        mock_videos = [
-            MagicMock(analysis_status=AnalysisStatus.PENDING, has_quiz=False),
-            MagicMock(analysis_status=AnalysisStatus.PENDING, has_quiz=False),
-            MagicMock(analysis_status=AnalysisStatus.COMPLETED, has_quiz=True),
-            MagicMock(analysis_status=AnalysisStatus.COMPLETED, has_quiz=False),
-            MagicMock(analysis_status=AnalysisStatus.FAILED, has_quiz=False),
+        # Aggregate rows: (status, count, count with quiz)
+        mock_rows = [
+            (AnalysisStatus.PENDING, 2, 0),
+            (AnalysisStatus.COMPLETED, 2, 1),
+            (AnalysisStatus.FAILED, 1, 0),
         ]
         
-        mock_async_session.execute.return_value.scalars.return_value.all.return_value = mock_videos
+        mock_async_session.execute.return_value = MagicMock()
+        mock_async_session.execute.return_value.all.return_value = mock_rows
         
         from app.services.processing_service import get_analysis_status
         
@@ -158,3 +185,27 @@ class TestGetAnalysisStatus:
         assert result["completed"] == 2
         assert result["failed"] == 1
         assert result["with_quiz"] == 1
+
+    @pytest.mark.asyncio
+    async def test_write_during_query_is_not_cached_under_new_version(self, mock_async_session):
+        """Verify a version bump mid-query leaves the result under the old key."""
+        from app.core.cache import bump_playlist_version, course_stats_cache
+        from app.models.enums import AnalysisStatus
+        from app.services.processing_service import get_analysis_status
+        
+        course_stats_cache.clear()
+        
+        async def execute_with_concurrent_write(*args, **kwargs):
+            # A write commits while the aggregate query is in flight
+            bump_playlist_version(99)
+            result = MagicMock()
+            result.all.return_value = [(AnalysisStatus.PENDING, 1, 0)]
+            return result
+        
+        mock_async_session.execute.side_effect = execute_with_concurrent_write
+        
+        await get_analysis_status(99, mock_async_session)
+        await get_analysis_status(99, mock_async_session)
+        
+        # The stale first result wasn't served to the second reader
+        assert mock_async_session.execute.await_count == 2
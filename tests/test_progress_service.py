@@ -0,0 +1,86 @@
+"""
+Progress Service Unit Tests
+
+Tests for quiz grading and the enrollment score counters.
+"""
+
+import uuid
+from unittest.mock import AsyncMock, MagicMock, patch
+
+import pytest
+
+
+class TestQuizScoreDelta:
+    """Tests for the quiz score counter deltas."""
+
+    def test_first_score_is_counted(self):
+        """Verify a first score adds to both the sum and the count."""
+        from app.services.progress_service import _quiz_score_delta
+        
+        assert _quiz_score_delta(None, 80) == (80, 1)
+
+    def test_retake_replaces_previous_score(self):
+        """Verify a retake only moves the sum by the difference."""
+        from app.services.progress_service import _quiz_score_delta
+        
+        assert _quiz_score_delta(60, 80) == (20, 0)
+        assert _quiz_score_delta(80, 60) == (-20, 0)
+
+
+class TestSubmitQuiz:
+    """Tests for submit_quiz's counter updates."""
+
+    @staticmethod
+    def _make_video() -> MagicMock:
+        video = MagicMock()
+        video.playlist_id = 3
+        video.has_quiz = True
+        video.quiz_data = {
+            "questions": [
+                {"q": "One?", "answer": "A"},
+                {"q": "Two?", "answer": "B"},
+            ]
+        }
+        return video
+
+    @pytest.mark.asyncio
+    async def test_retake_updates_counters_from_locked_row(self, mock_async_session):
+        """Verify the progress row is locked and a retake isn't counted twice."""
+        from app.services import progress_service
+        
+        enrollment = MagicMock()
+        enrollment.id = 5
+        progress = MagicMock()
+        progress.quiz_score = 50
+        
+        enrollment_result = MagicMock()
+        enrollment_result.scalar_one_or_none.return_value = enrollment
+        progress_result = MagicMock()
+        progress_result.scalar_one_or_none.return_value = progress
+        mock_async_session.execute.side_effect = [enrollment_result, progress_result]
+        
+        user = MagicMock()
+        user.id = uuid.uuid4()
+        
+        with patch.object(progress_service, "get_video_with_playlist", AsyncMock(return_value=self._make_video())), \
+             patch.object(progress_service, "update_enrollment_counters", AsyncMock()) as mock_counters, \
+             patch.object(progress_service, "check_and_update_enrollment_completion", AsyncMock()), \
+             patch.object(progress_service, "bump_playlist_version"), \
+             patch.object(progress_service, "invalidate_progress_snapshot"):
+            _, result = await progress_service.submit_quiz(
+                user, 10, {"0": " a ", "1": "b"}, mock_async_session
+            )
+        
+        assert result["score"] == 100
+        assert result["passed"] is True
+        assert progress.quiz_score == 100
+        
+        progress_query = mock_async_session.execute.call_args_list[1].args[0]
+        assert progress_query._for_update_arg is not None
+        
+        mock_counters.assert_awaited_once_with(
+            5,
+            mock_async_session,
+            score_sum_delta=50,
+            score_count_delta=0,
+        )
@@ -0,0 +1,40 @@
+"""
+Storage Service Unit Tests
+
+Tests for signed Cloudinary uploads.
+"""
+
+from unittest.mock import AsyncMock, MagicMock, patch
+
+import pytest
+
+
+class TestCloudinaryUpload:
+    """Tests for the async Cloudinary upload path."""
+
+    @pytest.mark.asyncio
+    async def test_upload_pdf_posts_signed_request(self):
+        """Verify the upload is signed with the API secret and returns secure_url."""
+        from cloudinary.utils import api_sign_request
+        from app.core.config import settings
+        from app.services import storage_service
+        
+        response = MagicMock()
+        response.json.return_value = {"secure_url": "https://res.cloudinary.com/x/raw/upload/c.pdf"}
+        
+        with patch.object(settings, "CLOUDINARY_CLOUD_NAME", "demo"), \
+             patch.object(settings, "CLOUDINARY_API_KEY", "key"), \
+             patch.object(settings, "CLOUDINARY_API_SECRET", "secret"), \
+             patch.object(storage_service, "post_with_retry", AsyncMock(return_value=response)) as mock_post:
+            url = await storage_service.CloudinaryService.upload_pdf(b"%PDF-1.4", "abc")
+        
+        assert url == "https://res.cloudinary.com/x/raw/upload/c.pdf"
+        
+        args, kwargs = mock_post.call_args
+        assert args[0] == "https://api.cloudinary.com/v1_1/demo/raw/upload"
+        data = dict(kwargs["data"])
+        signature = data.pop("signature")
+        assert data.pop("api_key") == "key"
+        assert data["public_id"] == "certificate_abc"
+        assert signature == api_sign_request(data, "secret")
+        assert kwargs["files"]["file"][1] == b"%PDF-1.4"
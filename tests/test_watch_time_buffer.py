@@ -0,0 +1,96 @@
+"""
+Watch Time Buffer Unit Tests
+
+Tests for heartbeat write coalescing.
+"""
+
+import uuid
+from unittest.mock import AsyncMock, MagicMock, patch
+
+import pytest
+
+
+USER_ID = uuid.UUID(int=7)
+
+
+def _make_progress(progress_id: int = 1, video_id: int = 10) -> MagicMock:
+    from app.models.enums import WatchStatus
+    
+    progress = MagicMock()
+    progress.id = progress_id
+    progress.video_id = video_id
+    progress.watch_status = WatchStatus.IN_PROGRESS
+    progress.seconds_watched = 30
+    progress.is_quiz_passed = False
+    progress.quiz_score = None
+    return progress
+
+
+class TestWatchTimeBuffer:
+    """Tests for buffering and flushing heartbeat watch times."""
+
+    def setup_method(self):
+        from app.services import watch_time_buffer
+        
+        watch_time_buffer._snapshot_cache.clear()
+        watch_time_buffer._pending.clear()
+
+    def test_heartbeats_coalesce_to_latest_value(self):
+        """Verify only the latest seconds_watched per row is kept."""
+        from app.services import watch_time_buffer
+        
+        snapshot = watch_time_buffer.cache_progress_snapshot(USER_ID, _make_progress())
+        watch_time_buffer.record_watch_time(snapshot, 60)
+        watch_time_buffer.record_watch_time(snapshot, 90)
+        
+        assert watch_time_buffer.get_progress_snapshot(USER_ID, 10).seconds_watched == 90
+        assert watch_time_buffer._pending == {1: 90}
+
+    def test_invalidate_drops_snapshot(self):
+        """Verify invalidated snapshots force the next heartbeat to the DB."""
+        from app.services import watch_time_buffer
+        
+        watch_time_buffer.cache_progress_snapshot(USER_ID, _make_progress())
+        watch_time_buffer.invalidate_progress_snapshot(USER_ID, 10)
+        
+        assert watch_time_buffer.get_progress_snapshot(USER_ID, 10) is None
+
+    @pytest.mark.asyncio
+    async def test_flush_writes_batch_and_clears_pending(self):
+        """Verify a flush issues one batched UPDATE for all pending rows."""
+        from app.services import watch_time_buffer
+        
+        watch_time_buffer._pending.update({1: 60, 2: 120})
+        
+        session = AsyncMock()
+        session_maker = MagicMock()
+        session_maker.return_value.__aenter__.return_value = session
+        
+        with patch.object(watch_time_buffer, "get_session_maker", return_value=session_maker):
+            flushed = await watch_time_buffer.flush_watch_time()
+        
+        assert flushed == 2
+        assert watch_time_buffer._pending == {}
+        session.execute.assert_awaited_once()
+        statement, params = session.execute.await_args.args
+        assert "greatest(" in str(statement).lower()
+        assert {p["progress_id"]: p["seconds"] for p in params} == {1: 60, 2: 120}
+        session.commit.assert_awaited_once()
+
+    @pytest.mark.asyncio
+    async def test_flush_failure_keeps_pending(self):
+        """Verify values survive a failed flush without clobbering newer ones."""
+        from app.services import watch_time_buffer
+        
+        watch_time_buffer._pending.update({1: 60})
+        
+        session = AsyncMock()
+        session.execute.side_effect = RuntimeError("db down")
+        session_maker = MagicMock()
+        session_maker.return_value.__aenter__.return_value = session
+        
+        with patch.object(watch_time_buffer, "get_session_maker", return_value=session_maker):
+            with pytest.raises(RuntimeError):
+                await watch_time_buffer.flush_watch_time()
+        
+        assert watch_time_buffer._pending == {1: 60}